@@ -1220,6 +1220,15 @@ def train_model(df):
     return model, df_scored, metrics
 
 
+@st.cache_resource
+def get_explainer(_model, _df, model_id):
+    """One initialized ScoreExplainer per trained model, kept across reruns
+    so its SHAP explainer and explanation memo survive between clicks."""
+    explainer = ScoreExplainer(_model)
+    explainer.initialize(_df)
+    return explainer
+
+
 # ─── Helper: Gauge Chart ───────────────────────────────────────────────────
 def create_gauge(score, grade, color):
     fig = go.Figure(go.Indicator(
@@ -1845,8 +1854,7 @@ def main():
                     st.markdown('<div class="section-header">🧠 <span class="accent">AI Explanation</span></div>',
                                unsafe_allow_html=True)
                     try:
-                        explainer = ScoreExplainer(model)
-                        explainer.initialize(df)
+                        explainer = get_explainer(model, df, id(model))
                         explanation = explainer.explain_single(profile)
                         col_e1, col_e2 = st.columns(2)
                         with col_e1:
@@ -0,0 +1,106 @@
+"""
+Profile the Loan Recommendation Engine
+======================================
+Runs get_transaction_loan_recommendations and
+get_persona_loan_recommendations over a spread of scores, incomes and
+personas under cProfile, then prints the top loan_engine functions by
+cumulative time (the two entry points themselves are left out).
+
+    python scripts/profile_loan_engine.py [--calls 2000] [--top 5] [--lines]
+
+--lines also runs line_profiler over those top functions, if installed.
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import loan_engine
+from src.loan_engine import (
+    PERSONA_LOANS,
+    get_transaction_loan_recommendations,
+    get_persona_loan_recommendations,
+)
+
+ENTRY_POINTS = {"get_transaction_loan_recommendations", "get_persona_loan_recommendations"}
+
+
+def make_cases(calls: int, seed: int = 42):
+    """Deterministic (transaction kwargs, persona kwargs) pairs."""
+    rng = random.Random(seed)
+    personas = list(PERSONA_LOANS)
+    cases = []
+    for _ in range(calls):
+        income = rng.choice([8000, 15000, 25000, 40000, 75000, 150000])
+        cases.append((
+            dict(score=rng.uniform(300, 900), monthly_income=income,
+                 monthly_expenses=income * rng.uniform(0, 0.5),
+                 existing_emi=income * rng.choice([0, 0, 0.1, 0.3, 0.6])),
+            dict(persona=rng.choice(personas), score=rng.uniform(300, 900),
+                 persona_data={"land_acres": rng.choice([0, 1.5, 4]),
+                               "years_in_trade": rng.choice([0, 2, 6])},
+                 monthly_income=rng.choice([0, 6000, 12000])),
+        ))
+    return cases
+
+
+def run(cases):
+    for txn_kwargs, persona_kwargs in cases:
+        get_transaction_loan_recommendations(**txn_kwargs)
+        get_persona_loan_recommendations(**persona_kwargs)
+
+
+def top_functions(stats: pstats.Stats, top: int):
+    """(name, calls, cumulative seconds) of the top loan_engine functions."""
+    rows = []
+    for (filename, _, name), (_, calls, _, cumtime, _) in stats.stats.items():
+        if filename == loan_engine.__file__ and name not in ENTRY_POINTS:
+            rows.append((name, calls, cumtime))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--lines", action="store_true")
+    args = parser.parse_args()
+
+    cases = make_cases(args.calls)
+    run(cases[:50])  # warm up lookup tables and any numba kernels
+
+    profiler = cProfile.Profile()
+    profiler.runcall(run, cases)
+    stats = pstats.Stats(profiler)
+    total = stats.total_tt
+
+    print(f"{args.calls} transaction + persona recommendation pairs: {total:.2f}s")
+    print(f"Top {args.top} loan_engine functions by cumulative time:")
+    ranked = top_functions(stats, args.top)
+    for name, calls, cumtime in ranked:
+        print(f"  {name:<40} {calls:>8} calls  {cumtime:7.3f}s  {cumtime / total:6.1%}")
+
+    if args.lines:
+        try:
+            from line_profiler import LineProfiler
+        except ImportError:
+            print("line_profiler is not installed; skipping --lines")
+            return
+        line_profiler = LineProfiler()
+        for name, _, _ in ranked:
+            func = getattr(loan_engine, name, None)
+            # numba kernels and nested helpers aren't line-profilable
+            if callable(func) and hasattr(func, "__code__"):
+                line_profiler.add_function(func)
+        line_profiler.runcall(run, cases)
+        line_profiler.print_stats()
+
+
+if __name__ == "__main__":
+    main()
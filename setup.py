@@ -0,0 +1,21 @@
+"""
+Build script for CrediVist's optional compiled extension.
+
+The app runs from source (pip install -r requirements.txt); this only builds
+the Cython EMI kernels in src/_emi.pyx, which loan_engine uses in place of
+its numba kernels when numba is not installed:
+
+    pip install cython
+    python setup.py build_ext --inplace
+"""
+
+from setuptools import Extension, setup
+from Cython.Build import cythonize
+
+setup(
+    name="credivist-emi",
+    ext_modules=cythonize(
+        [Extension("src._emi", ["src/_emi.pyx"])],
+        compiler_directives={"language_level": 3},
+    ),
+)
@@ -0,0 +1,37 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled EMI kernels for deployments that cannot ship numba/LLVM.
+
+Optional: loan_engine binds these only when numba is not installed and
+this module has been built in place (needs Cython and a C compiler):
+
+    python setup.py build_ext --inplace
+
+Same formula and guards as the numba kernels in loan_engine, so results
+are identical (no fast-math: EMIs are rounded to paise downstream).
+"""
+
+from libc.math cimport pow as cpow
+
+
+cpdef double emi(double principal, double annual_rate, double tenure_months):
+    """Unrounded EMI for a positive principal, rate and tenure."""
+    cdef double r = annual_rate / (12 * 100)  # monthly rate
+    cdef double f = cpow(1.0 + r, tenure_months)
+    return principal * r * f / (f - 1.0)
+
+
+def emi_batch(const double[::1] principals, const double[::1] annual_rates,
+              const double[::1] tenures, double[::1] out):
+    """Unrounded EMIs of aligned 1-D arrays into `out`, same guards."""
+    cdef Py_ssize_t i
+    cdef double p, n
+    for i in range(principals.shape[0]):
+        p = principals[i]
+        n = tenures[i]
+        if p <= 0 or n <= 0:
+            out[i] = 0.0
+        elif annual_rates[i] <= 0:
+            out[i] = p / n
+        else:
+            out[i] = emi(p, annual_rates[i], n)
@@ -19,7 +19,8 @@ import json
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -143,8 +144,12 @@ def find_amounts(text: str) -> List[float]:
     return amounts
 
 
-def find_percentage(text: str, keywords: List[str]) -> Optional[float]:
+def find_percentage(text: Union[str, "TextView"], keywords: List[str]) -> Optional[float]:
     """Find percentage near given keywords."""
+    if isinstance(text, TextView):
+        if text.numbers is not None:
+            return text.numbers.percentage(text.lower, keywords)
+        text = text.raw
     for kw in keywords:
         patterns = [
             rf'{kw}[:\s]*(\d+(?:\.\d+)?)\s*%',
@@ -158,8 +163,12 @@ def find_percentage(text: str, keywords: List[str]) -> Optional[float]:
     return None
 
 
-def find_number_near(text: str, keywords: List[str]) -> Optional[float]:
+def find_number_near(text: Union[str, "TextView"], keywords: List[str]) -> Optional[float]:
     """Find a number near given keywords."""
+    if isinstance(text, TextView):
+        if text.numbers is not None:
+            return text.numbers.number_near(text.lower, keywords)
+        text = text.raw
     for kw in keywords:
         patterns = [
             rf'{kw}[:\s]*(\d+(?:\.\d+)?)',
@@ -172,9 +181,9 @@ def find_number_near(text: str, keywords: List[str]) -> Optional[float]:
     return None
 
 
-def text_contains_any(text: str, keywords: List[str]) -> bool:
+def text_contains_any(text: Union[str, "TextView"], keywords: List[str]) -> bool:
     """Check if text contains any of the keywords."""
-    text_lower = text.lower()
+    text_lower = text.lower if isinstance(text, TextView) else text.lower()
     return any(kw.lower() in text_lower for kw in keywords)
 
 
@@ -191,6 +200,145 @@ def count_dates(text: str) -> int:
     return count
 
 
+# ─── Numeric Context Scanner ────────────────────────────────────────────────
+
+# Zero-width match at the start of every digit run, capturing the number there
+_NUMBER_START_RE = re.compile(r'(?<!\d)(?=(\d+(?:\.\d+)?))')
+
+
+@dataclass(frozen=True)
+class NumericContexts:
+    """
+    Every number in a text, keyed by where its keyword context sits.
+
+    Positions index the lowercased text:
+      - after_keyword:  end of "kw[: ]*" before the number  → number
+      - before_keyword: start of " kw" after the number      → number
+      - pct_after:      as after_keyword, number followed by "%"
+      - percent_after:  as after_keyword, number followed by "percent"
+      - pct_before:     start of "kw" after "number %"       → number
+
+    Lookups walk the occurrences of a keyword with str.find and probe these
+    maps, giving the same answers as the per-keyword regexes in
+    find_number_near / find_percentage without rescanning the whole text.
+    """
+    after_keyword: Dict[int, float]
+    before_keyword: Dict[int, float]
+    pct_after: Dict[int, float]
+    percent_after: Dict[int, float]
+    pct_before: Dict[int, float]
+
+    @staticmethod
+    def _first_hit(text_lower: str, kw: str, index: Dict[int, float],
+                   at_end: bool) -> Optional[float]:
+        if not index:
+            return None
+        pos = text_lower.find(kw)
+        while pos != -1:
+            key = pos + len(kw) if at_end else pos
+            if key in index:
+                return index[key]
+            pos = text_lower.find(kw, pos + 1)
+        return None
+
+    def number_near(self, text_lower: str, keywords: List[str]) -> Optional[float]:
+        """Lookup equivalent of find_number_near()."""
+        for kw in keywords:
+            kw = kw.lower()
+            for index, at_end in ((self.after_keyword, True),
+                                  (self.before_keyword, False)):
+                val = self._first_hit(text_lower, kw, index, at_end)
+                if val is not None:
+                    return val
+        return None
+
+    def percentage(self, text_lower: str, keywords: List[str]) -> Optional[float]:
+        """Lookup equivalent of find_percentage()."""
+        for kw in keywords:
+            kw = kw.lower()
+            for index, at_end in ((self.pct_after, True),
+                                  (self.percent_after, True),
+                                  (self.pct_before, False)):
+                val = self._first_hit(text_lower, kw, index, at_end)
+                if val is not None:
+                    return val
+        return None
+
+
+def scan_numeric_contexts(text: str) -> NumericContexts:
+    """Index every number in `text` with its keyword context in one pass."""
+    n = len(text)
+    after_kw, before_kw, pct_after, percent_after, pct_before = {}, {}, {}, {}, {}
+
+    for m in _NUMBER_START_RE.finditer(text):
+        number = m.group(1)
+        value = float(number)
+        start = m.start()
+        end = start + len(number)
+
+        prefix_end = start
+        while prefix_end > 0 and (text[prefix_end - 1] == ":" or text[prefix_end - 1].isspace()):
+            prefix_end -= 1
+        suffix_start = end
+        while suffix_start < n and text[suffix_start].isspace():
+            suffix_start += 1
+
+        # Keep the leftmost number for each context, as re.search would
+        after_kw.setdefault(prefix_end, value)
+        before_kw.setdefault(suffix_start, value)
+        if suffix_start < n and text[suffix_start] == "%":
+            pct_after.setdefault(prefix_end, value)
+            kw_start = suffix_start + 1
+            while kw_start < n and text[kw_start].isspace():
+                kw_start += 1
+            pct_before.setdefault(kw_start, value)
+        elif text[suffix_start:suffix_start + 7].lower() == "percent":
+            percent_after.setdefault(prefix_end, value)
+
+    return NumericContexts(after_kw, before_kw, pct_after, percent_after, pct_before)
+
+
+# ─── Shared Text View ───────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class TextView:
+    """
+    Pre-tokenized view of a document's text.
+
+    Built once per analysis so relevance checks, persona detection and the
+    extractors share the lowercased text, word tokens, amounts and date
+    count instead of re-deriving them from the raw string on every call.
+    """
+    raw: str
+    lower: str
+    tokens: Tuple[str, ...]
+    amounts: Tuple[float, ...]
+    dates: int
+    numbers: Optional[NumericContexts] = None
+
+    @classmethod
+    def from_text(cls, text: str) -> "TextView":
+        lower = text.lower()
+        # Case folding can change string length for a few characters; the
+        # numeric index is position-based, so fall back to regexes then.
+        numbers = scan_numeric_contexts(text) if len(lower) == len(text) else None
+        return cls(
+            raw=text,
+            lower=lower,
+            tokens=tuple(lower.split()),
+            amounts=tuple(find_amounts(text)),
+            dates=count_dates(text),
+            numbers=numbers,
+        )
+
+
+def as_text_view(text: Union[str, TextView]) -> TextView:
+    """Return `text` as a TextView, building one if a plain string is given."""
+    if isinstance(text, TextView):
+        return text
+    return TextView.from_text(text)
+
+
 # ─── Auto-Detect Persona ────────────────────────────────────────────────────
 
 PERSONA_KEYWORDS = {
@@ -228,12 +376,12 @@ PERSONA_KEYWORDS = {
 }
 
 
-def auto_detect_persona(text: str) -> Tuple[str, float]:
+def auto_detect_persona(text: Union[str, TextView]) -> Tuple[str, float]:
     """
     Detect the most likely persona from document text.
     Returns (persona_key, confidence).
     """
-    text_lower = text.lower()
+    text_lower = as_text_view(text).lower
     scores = {}
 
     for persona, keywords in PERSONA_KEYWORDS.items():
@@ -250,19 +398,21 @@ def auto_detect_persona(text: str) -> Tuple[str, float]:
 
 # ─── Persona-Specific Extractors ────────────────────────────────────────────
 
-def extract_farmer_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
+def extract_farmer_data(text: Union[str, TextView], df: Optional[pd.DataFrame]) -> Dict:
     """Extract farmer-related data from documents."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
 
     # Land ownership
-    data["owns_land"] = text_contains_any(text, [
+    data["owns_land"] = text_contains_any(view, [
         "owner", "patta", "khata", "land owner", "own name",
         "registered in the name", "title deed"
     ])
 
     # Land area
-    acres = find_number_near(text, ["acre", "acres", "acr"])
-    hectares = find_number_near(text, ["hectare", "hectares", "ha"])
+    acres = find_number_near(view, ["acre", "acres", "acr"])
+    hectares = find_number_near(view, ["hectare", "hectares", "ha"])
     if acres:
         data["land_acres"] = min(acres, 100)
     elif hectares:
@@ -271,7 +421,7 @@ def extract_farmer_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
         data["land_acres"] = 2.0
 
     # Years on land
-    years = find_number_near(text, ["years", "year", "since"])
+    years = find_number_near(view, ["years", "year", "since"])
     if years and years < 100:
         data["years_on_land"] = int(years)
     else:
@@ -279,70 +429,72 @@ def extract_farmer_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
 
     # Crop info
     crop_keywords = ["kharif", "rabi", "zaid", "summer", "winter", "crop"]
-    seasons = sum(1 for k in crop_keywords if k in text.lower())
+    seasons = sum(1 for k in crop_keywords if k in view.lower)
     data["seasons_active"] = max(min(seasons * 2, 12), 2)
 
     crops_found = sum(1 for c in [
         "wheat", "rice", "paddy", "maize", "cotton", "sugarcane",
         "soybean", "groundnut", "mustard", "potato", "onion",
         "tomato", "vegetables", "pulses", "dal", "millets"
-    ] if c in text.lower())
+    ] if c in view.lower)
     data["crops_per_year"] = max(min(crops_found, 4), 1)
 
     # Yield trend
-    if text_contains_any(text, ["increase", "growth", "improved", "higher"]):
+    if text_contains_any(view, ["increase", "growth", "improved", "higher"]):
         data["yield_trend"] = "up"
-    elif text_contains_any(text, ["decrease", "decline", "reduced", "lower"]):
+    elif text_contains_any(view, ["decrease", "decline", "reduced", "lower"]):
         data["yield_trend"] = "down"
     else:
         data["yield_trend"] = "stable"
 
     # Government schemes
-    data["has_pm_kisan"] = text_contains_any(text, [
+    data["has_pm_kisan"] = text_contains_any(view, [
         "pm-kisan", "pm kisan", "pradhan mantri kisan", "kisan samman"
     ])
-    data["has_crop_insurance"] = text_contains_any(text, [
+    data["has_crop_insurance"] = text_contains_any(view, [
         "pmfby", "crop insurance", "fasal bima", "pradhan mantri fasal"
     ])
-    data["has_soil_health_card"] = text_contains_any(text, [
+    data["has_soil_health_card"] = text_contains_any(view, [
         "soil health card", "soil card", "soil test"
     ])
-    data["kcc_holder"] = text_contains_any(text, [
+    data["kcc_holder"] = text_contains_any(view, [
         "kcc", "kisan credit card", "kisan credit"
     ])
 
     # Market engagement
-    data["sells_at_mandi"] = text_contains_any(text, [
+    data["sells_at_mandi"] = text_contains_any(view, [
         "mandi", "market yard", "apmc", "agricultural market"
     ])
-    data["has_warehouse_receipt"] = text_contains_any(text, [
+    data["has_warehouse_receipt"] = text_contains_any(view, [
         "warehouse", "godown", "storage receipt", "wdra"
     ])
-    data["uses_enam"] = text_contains_any(text, [
+    data["uses_enam"] = text_contains_any(view, [
         "e-nam", "enam", "national agriculture market"
     ])
-    mandi_trips = find_number_near(text, ["trip", "visit", "mandi"])
+    mandi_trips = find_number_near(view, ["trip", "visit", "mandi"])
     data["avg_trips_per_month"] = int(min(mandi_trips or 2, 30))
 
     # Community
-    data.update(_extract_community_data(text))
+    data.update(_extract_community_data(view))
 
     # Utility
-    data.update(_extract_utility_data(text, df))
+    data.update(_extract_utility_data(view, df))
 
     # Mobile
-    data.update(_extract_mobile_data(text))
+    data.update(_extract_mobile_data(view))
 
     return data
 
 
-def extract_student_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
+def extract_student_data(text: Union[str, TextView], df: Optional[pd.DataFrame]) -> Dict:
     """Extract student-related data from documents."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
 
     # Academic performance
-    cgpa = find_number_near(text, ["cgpa", "cpi", "gpa", "spi"])
-    pct = find_percentage(text, ["marks", "score", "percentage", "aggregate", "total"])
+    cgpa = find_number_near(view, ["cgpa", "cpi", "gpa", "spi"])
+    pct = find_percentage(view, ["marks", "score", "percentage", "aggregate", "total"])
 
     if cgpa and cgpa <= 10:
         data["score_type"] = "cgpa"
@@ -372,14 +524,14 @@ def extract_student_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
             data["score_value"] = 65.0
 
     # Education level — check PG first (more specific), then UG
-    if text_contains_any(text, ["post graduate", "m.tech", "mba", "m.sc", "m.a.",
+    if text_contains_any(view, ["post graduate", "m.tech", "mba", "m.sc", "m.a.",
                                  "master of", "masters"]):
         data["education_level"] = "pg"
-    elif text_contains_any(text, ["b.tech", "b.e.", "b.e ", "bba", "b.sc", "b.com",
+    elif text_contains_any(view, ["b.tech", "b.e.", "b.e ", "bba", "b.sc", "b.com",
                                    "b.a.", "b.a ", "bachelor", "engineering",
                                    "degree", "undergraduate", "usn"]):
         data["education_level"] = "ug"
-    elif text_contains_any(text, ["class 10", "class 12", "sslc", "hsc",
+    elif text_contains_any(view, ["class 10", "class 12", "sslc", "hsc",
                                    "cbse", "icse", "school"]):
         data["education_level"] = "school"
     else:
@@ -392,21 +544,21 @@ def extract_student_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
     )
     if backlog_match:
         data["backlog_count"] = int(min(int(backlog_match.group(1)), 20))
-    elif text_contains_any(text, ["no backlog", "no arrear", "clear", "0 backlog"]):
+    elif text_contains_any(view, ["no backlog", "no arrear", "clear", "0 backlog"]):
         data["backlog_count"] = 0
     else:
         data["backlog_count"] = 0
 
     # Scholarships
     scholarship_keywords = ["scholarship", "merit award", "fellowship", "stipend", "bursary"]
-    scholarship_count = sum(1 for k in scholarship_keywords if k in text.lower())
+    scholarship_count = sum(1 for k in scholarship_keywords if k in view.lower)
     data["scholarships_received"] = max(scholarship_count, 0)
 
-    amounts = find_amounts(text)
+    amounts = view.amounts
     scholarship_amounts = [a for a in amounts if 500 <= a <= 500000]
     data["total_scholarship_value"] = sum(scholarship_amounts) if scholarship_amounts else 0
 
-    data["merit_based"] = text_contains_any(text, [
+    data["merit_based"] = text_contains_any(view, [
         "merit", "topper", "rank", "distinction", "first class"
     ])
 
@@ -415,22 +567,22 @@ def extract_student_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
     platform_list = ["nptel", "coursera", "udemy", "edx", "swayam", "nsdc",
                      "pmkvy", "skill india", "google", "microsoft", "aws"]
     for p in platform_list:
-        if p in text.lower():
+        if p in view.lower:
             cert_platforms.append(p.upper() if len(p) <= 5 else p.title())
     data["platform_certs"] = cert_platforms
     data["cert_count"] = max(len(cert_platforms), 0)
-    data["has_govt_certification"] = text_contains_any(text, [
+    data["has_govt_certification"] = text_contains_any(view, [
         "nsdc", "pmkvy", "skill india", "government certified", "govt cert"
     ])
 
     # Attendance
-    att_pct = find_percentage(text, ["attendance", "present"])
+    att_pct = find_percentage(view, ["attendance", "present"])
     data["attendance_pct"] = att_pct if att_pct else 75
 
     # Part-time income
     part_time_keywords = ["freelance", "part-time", "part time", "tutoring",
                           "tuition", "intern", "stipend", "earning"]
-    data["has_part_time"] = text_contains_any(text, part_time_keywords)
+    data["has_part_time"] = text_contains_any(view, part_time_keywords)
     if data["has_part_time"]:
         # Look for earnings/stipend amount near relevant keywords
         earn_match = re.search(
@@ -442,7 +594,7 @@ def extract_student_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
         else:
             earnings = [a for a in amounts if 1000 <= a <= 30000]
             data["monthly_earnings"] = earnings[0] if earnings else 5000
-        months = find_number_near(text, ["month", "months"])
+        months = find_number_near(view, ["month", "months"])
         data["months_active"] = int(min(months or 3, 60))
     else:
         data["monthly_earnings"] = 0
@@ -454,44 +606,46 @@ def extract_student_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
                 "tier 3": 3, "tier-3": 3, "private": 3}
     data["institution_tier"] = 3
     for keyword, tier in tier_map.items():
-        if keyword in text.lower():
+        if keyword in view.lower:
             data["institution_tier"] = tier
             break
 
     high_demand = ["computer", "cse", "it", "information technology", "data science",
                    "ai", "artificial intelligence", "electronics", "ece", "mechanical"]
     low_demand = ["arts", "history", "philosophy", "library"]
-    if text_contains_any(text, high_demand):
+    if text_contains_any(view, high_demand):
         data["branch_demand"] = "high"
-    elif text_contains_any(text, low_demand):
+    elif text_contains_any(view, low_demand):
         data["branch_demand"] = "low"
     else:
         data["branch_demand"] = "medium"
 
-    data["has_internship"] = text_contains_any(text, [
+    data["has_internship"] = text_contains_any(view, [
         "intern", "internship", "industrial training", "summer training"
     ])
 
     # Community
-    data.update(_extract_community_data(text))
+    data.update(_extract_community_data(view))
 
     # Mobile
-    data.update(_extract_mobile_data(text))
+    data.update(_extract_mobile_data(view))
 
     return data
 
 
-def extract_vendor_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
+def extract_vendor_data(text: Union[str, TextView], df: Optional[pd.DataFrame]) -> Dict:
     """Extract street vendor / informal worker data."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
 
     # Daily income
-    daily = find_number_near(text, ["daily income", "daily earning", "per day",
+    daily = find_number_near(view, ["daily income", "daily earning", "per day",
                                      "daily sale", "daily collection"])
     if daily and daily < 50000:
         data["avg_daily_income"] = daily
     else:
-        amounts = find_amounts(text)
+        amounts = view.amounts
         small_amounts = [a for a in amounts if 100 <= a <= 5000]
         data["avg_daily_income"] = np.mean(small_amounts) if small_amounts else 500
 
@@ -511,26 +665,26 @@ def extract_vendor_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
                 else:
                     data["seasonal_variation"] = "high"
     else:
-        days = find_number_near(text, ["working day", "days worked", "business day"])
+        days = find_number_near(view, ["working day", "days worked", "business day"])
         data["working_days_per_month"] = int(min(days or 25, 31))
 
     if "seasonal_variation" not in data:
-        if text_contains_any(text, ["regular", "consistent", "steady", "stable"]):
+        if text_contains_any(view, ["regular", "consistent", "steady", "stable"]):
             data["seasonal_variation"] = "low"
-        elif text_contains_any(text, ["seasonal", "fluctuate", "varies"]):
+        elif text_contains_any(view, ["seasonal", "fluctuate", "varies"]):
             data["seasonal_variation"] = "high"
         else:
             data["seasonal_variation"] = "medium"
 
     # Rental
-    data["pays_rent"] = text_contains_any(text, [
+    data["pays_rent"] = text_contains_any(view, [
         "rent", "stall fee", "market fee", "shop rent", "lease"
     ])
     if data["pays_rent"]:
-        rent_amounts = [a for a in find_amounts(text) if 500 <= a <= 50000]
+        rent_amounts = [a for a in view.amounts if 500 <= a <= 50000]
         data["rent_amount"] = rent_amounts[0] if rent_amounts else 2000
-        data["on_time_pct"] = find_percentage(text, ["on time", "timely", "paid"]) or 80
-        months = find_number_near(text, ["month", "year"])
+        data["on_time_pct"] = find_percentage(view, ["on time", "timely", "paid"]) or 80
+        months = find_number_near(view, ["month", "year"])
         if months and months <= 30:
             data["months_of_history"] = int(months * 12)
         elif months and months <= 360:
@@ -543,33 +697,35 @@ def extract_vendor_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
         data["months_of_history"] = 0
 
     # Years in trade
-    years = find_number_near(text, ["years in", "experience", "since", "doing this for"])
+    years = find_number_near(view, ["years in", "experience", "since", "doing this for"])
     data["years_in_trade"] = int(min(years or 5, 50))
-    data["same_location"] = text_contains_any(text, [
+    data["same_location"] = text_contains_any(view, [
         "same location", "same place", "same spot", "same area", "permanent"
     ])
-    data["has_license"] = text_contains_any(text, [
+    data["has_license"] = text_contains_any(view, [
         "license", "licence", "permit", "registration", "trade license",
         "vendor license", "fssai"
     ])
 
     # Utility, Community, Mobile, Savings
-    data.update(_extract_utility_data(text, df))
-    data.update(_extract_savings_data(text))
-    data.update(_extract_community_data(text))
-    data.update(_extract_mobile_data(text))
+    data.update(_extract_utility_data(view, df))
+    data.update(_extract_savings_data(view))
+    data.update(_extract_community_data(view))
+    data.update(_extract_mobile_data(view))
 
     return data
 
 
-def extract_homemaker_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
+def extract_homemaker_data(text: Union[str, TextView], df: Optional[pd.DataFrame]) -> Dict:
     """Extract homemaker-related data."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
 
     # Household budgeting
-    income = find_number_near(text, ["household income", "family income", "total income",
+    income = find_number_near(view, ["household income", "family income", "total income",
                                       "monthly income"])
-    expense = find_number_near(text, ["household expense", "family expense", "total expense",
+    expense = find_number_near(view, ["household expense", "family expense", "total expense",
                                        "monthly expense", "expenditure"])
 
     if df is not None and len(df) > 0:
@@ -587,10 +743,10 @@ def extract_homemaker_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
 
     data["household_income"] = income if income and income > 0 else 20000
     data["household_expenses"] = expense if expense and expense > 0 else 15000
-    data["manages_budget"] = text_contains_any(text, [
+    data["manages_budget"] = text_contains_any(view, [
         "budget", "manage", "plan", "track", "record", "diary", "register"
     ]) or (df is not None)  # If they have a spreadsheet, they manage budget
-    dependents = find_number_near(text, ["dependent", "children", "family member", "members"])
+    dependents = find_number_near(view, ["dependent", "children", "family member", "members"])
     data["dependents"] = int(min(dependents or 3, 15))
 
     # Micro enterprise
@@ -605,15 +761,15 @@ def extract_homemaker_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
     data["has_enterprise"] = False
     data["enterprise_type"] = ""
     for kw, etype in enterprise_keywords.items():
-        if kw in text.lower():
+        if kw in view.lower:
             data["has_enterprise"] = True
             data["enterprise_type"] = etype
             break
 
     if data["has_enterprise"]:
-        rev = find_number_near(text, ["revenue", "income", "earning", "monthly", "sale"])
+        rev = find_number_near(view, ["revenue", "income", "earning", "monthly", "sale"])
         data["monthly_revenue"] = min(rev or 5000, 500000)
-        months = find_number_near(text, ["month", "running for", "active for"])
+        months = find_number_near(view, ["month", "running for", "active for"])
         data["months_active"] = int(min(months or 6, 120))
     else:
         data["monthly_revenue"] = 0
@@ -621,31 +777,33 @@ def extract_homemaker_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
 
     # Skill certifications
     cert_kws = ["nsdc", "pmkvy", "skill india", "certificate", "training", "course"]
-    data["cert_count"] = sum(1 for k in cert_kws if k in text.lower())
-    data["has_govt_certification"] = text_contains_any(text, ["nsdc", "pmkvy", "skill india", "govt"])
+    data["cert_count"] = sum(1 for k in cert_kws if k in view.lower)
+    data["has_govt_certification"] = text_contains_any(view, ["nsdc", "pmkvy", "skill india", "govt"])
     data["platform_certs"] = []
 
     # Shared extractors
-    data.update(_extract_utility_data(text, df))
-    data.update(_extract_savings_data(text))
-    data.update(_extract_community_data(text))
-    data.update(_extract_mobile_data(text))
+    data.update(_extract_utility_data(view, df))
+    data.update(_extract_savings_data(view))
+    data.update(_extract_community_data(view))
+    data.update(_extract_mobile_data(view))
 
     return data
 
 
-def extract_general_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
+def extract_general_data(text: Union[str, TextView], df: Optional[pd.DataFrame]) -> Dict:
     """Extract data for general (no bank account) persona."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
 
     # ID verification
-    data["has_aadhaar"] = text_contains_any(text, ["aadhaar", "aadhar", "uid", "unique identification"])
-    data["has_pan"] = text_contains_any(text, ["pan card", "pan no", "permanent account number"])
-    data["has_voter_id"] = text_contains_any(text, ["voter", "election card", "epic"])
-    data["has_ration_card"] = text_contains_any(text, ["ration card", "ration", "bpl card", "apl card"])
+    data["has_aadhaar"] = text_contains_any(view, ["aadhaar", "aadhar", "uid", "unique identification"])
+    data["has_pan"] = text_contains_any(view, ["pan card", "pan no", "permanent account number"])
+    data["has_voter_id"] = text_contains_any(view, ["voter", "election card", "epic"])
+    data["has_ration_card"] = text_contains_any(view, ["ration card", "ration", "bpl card", "apl card"])
 
     # If ID doc is uploaded, mark aadhaar as present even if text extraction fails
-    if text_contains_any(text, ["government of india", "male", "female",
+    if text_contains_any(view, ["government of india", "male", "female",
                                  "date of birth", "dob", "address"]):
         if not data["has_aadhaar"] and not data["has_pan"]:
             data["has_aadhaar"] = True
@@ -663,44 +821,46 @@ def extract_general_data(text: str, df: Optional[pd.DataFrame]) -> Dict:
         data["q5_responsibility"] = 4
 
     # Shared extractors
-    data.update(_extract_utility_data(text, df))
-    data.update(_extract_savings_data(text))
-    data.update(_extract_community_data(text))
-    data.update(_extract_mobile_data(text))
-    data.update(_extract_rental_data(text))
+    data.update(_extract_utility_data(view, df))
+    data.update(_extract_savings_data(view))
+    data.update(_extract_community_data(view))
+    data.update(_extract_mobile_data(view))
+    data.update(_extract_rental_data(view))
 
     return data
 
 
 # ─── Shared Sub-Extractors ──────────────────────────────────────────────────
 
-def _extract_utility_data(text: str, df: Optional[pd.DataFrame] = None) -> Dict:
+def _extract_utility_data(text: Union[str, TextView], df: Optional[pd.DataFrame] = None) -> Dict:
     """Extract utility bill information."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
-    data["has_electricity"] = text_contains_any(text, [
+    data["has_electricity"] = text_contains_any(view, [
         "electricity", "electric", "bescom", "msedcl", "kseb", "discom",
         "power bill", "eb bill", "light bill"
     ])
-    data["has_water"] = text_contains_any(text, [
+    data["has_water"] = text_contains_any(view, [
         "water bill", "water supply", "bwssb", "jal board", "water charge"
     ])
-    data["has_gas"] = text_contains_any(text, [
+    data["has_gas"] = text_contains_any(view, [
         "gas", "lpg", "cylinder", "bharat gas", "hp gas", "indane", "piped gas"
     ])
 
     services = sum([data["has_electricity"], data["has_water"], data["has_gas"]])
 
     # Estimate bills per year
-    bill_dates = count_dates(text)
+    bill_dates = view.dates
     data["bills_per_year"] = min(max(bill_dates, services * 4), 36)
 
     # On-time percentage
-    on_time = find_percentage(text, ["on time", "timely", "before due"])
+    on_time = find_percentage(view, ["on time", "timely", "before due"])
     if on_time:
         data["on_time_pct"] = min(on_time, 100)
-    elif text_contains_any(text, ["overdue", "late fee", "penalty", "delayed"]):
+    elif text_contains_any(view, ["overdue", "late fee", "penalty", "delayed"]):
         data["on_time_pct"] = 60
-    elif text_contains_any(text, ["paid", "receipt", "payment received"]):
+    elif text_contains_any(view, ["paid", "receipt", "payment received"]):
         data["on_time_pct"] = 85
     else:
         data["on_time_pct"] = 75
@@ -708,40 +868,44 @@ def _extract_utility_data(text: str, df: Optional[pd.DataFrame] = None) -> Dict:
     return data
 
 
-def _extract_savings_data(text: str) -> Dict:
+def _extract_savings_data(text: Union[str, TextView]) -> Dict:
     """Extract savings habit information."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
 
-    if text_contains_any(text, ["self help group", "shg", "mahila group", "bachat gat"]):
+    if text_contains_any(view, ["self help group", "shg", "mahila group", "bachat gat"]):
         data["savings_method"] = "shg"
         data["is_shg_member"] = True
-    elif text_contains_any(text, ["chit fund", "chitty", "chit"]):
+    elif text_contains_any(view, ["chit fund", "chitty", "chit"]):
         data["savings_method"] = "chit_fund"
         data["is_shg_member"] = False
-    elif text_contains_any(text, ["post office", "postal saving", "nsc", "kvp", "rd receipt"]):
+    elif text_contains_any(view, ["post office", "postal saving", "nsc", "kvp", "rd receipt"]):
         data["savings_method"] = "post_office"
         data["is_shg_member"] = False
-    elif text_contains_any(text, ["gold", "jewel", "ornament"]):
+    elif text_contains_any(view, ["gold", "jewel", "ornament"]):
         data["savings_method"] = "gold"
         data["is_shg_member"] = False
-    elif text_contains_any(text, ["saving", "deposit", "bank"]):
+    elif text_contains_any(view, ["saving", "deposit", "bank"]):
         data["savings_method"] = "bank"
         data["is_shg_member"] = False
     else:
         data["savings_method"] = "cash_at_home"
         data["is_shg_member"] = False
 
-    savings_amt = find_number_near(text, ["saving", "deposit", "contribution", "monthly saving"])
+    savings_amt = find_number_near(view, ["saving", "deposit", "contribution", "monthly saving"])
     data["monthly_savings"] = min(savings_amt or 500, 100000)
 
-    months = find_number_near(text, ["months saving", "saving for", "since"])
+    months = find_number_near(view, ["months saving", "saving for", "since"])
     data["months_saving"] = int(min(months or 6, 120))
 
     return data
 
 
-def _extract_community_data(text: str) -> Dict:
+def _extract_community_data(text: Union[str, TextView]) -> Dict:
     """Extract community trust information."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
 
     # References
@@ -770,7 +934,7 @@ def _extract_community_data(text: str) -> Dict:
 
     data["references_count"] = min(ref_count, 10) if ref_count > 0 else 2
 
-    data["is_group_member"] = text_contains_any(text, [
+    data["is_group_member"] = text_contains_any(view, [
         "group", "member", "association", "union", "society", "committee",
         "shg", "federation", "cooperative"
     ])
@@ -778,15 +942,15 @@ def _extract_community_data(text: str) -> Dict:
     if data["is_group_member"]:
         for gtype in ["SHG", "Cooperative", "Trade Union", "Farmers Association",
                        "Vendors Association", "Mahila Mandal", "Youth Club"]:
-            if gtype.lower() in text.lower():
+            if gtype.lower() in view.lower:
                 data["group_type"] = gtype
                 break
 
-    years = find_number_near(text, ["years in community", "living here", "resident since",
+    years = find_number_near(view, ["years in community", "living here", "resident since",
                                      "years at address", "residing for"])
     data["years_in_community"] = int(min(years or 5, 50))
 
-    data["has_local_business_reference"] = text_contains_any(text, [
+    data["has_local_business_reference"] = text_contains_any(view, [
         "business reference", "shop owner", "employer", "contractor",
         "local business", "merchant"
     ])
@@ -794,48 +958,52 @@ def _extract_community_data(text: str) -> Dict:
     return data
 
 
-def _extract_mobile_data(text: str) -> Dict:
+def _extract_mobile_data(text: Union[str, TextView]) -> Dict:
     """Extract mobile behaviour data."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
 
-    if text_contains_any(text, ["monthly plan", "monthly recharge", "postpaid"]):
+    if text_contains_any(view, ["monthly plan", "monthly recharge", "postpaid"]):
         data["recharge_frequency"] = "monthly"
-    elif text_contains_any(text, ["weekly recharge", "weekly plan"]):
+    elif text_contains_any(view, ["weekly recharge", "weekly plan"]):
         data["recharge_frequency"] = "weekly"
-    elif text_contains_any(text, ["daily recharge", "daily data"]):
+    elif text_contains_any(view, ["daily recharge", "daily data"]):
         data["recharge_frequency"] = "daily"
     else:
         data["recharge_frequency"] = "monthly"
 
-    data["has_smartphone"] = text_contains_any(text, [
+    data["has_smartphone"] = text_contains_any(view, [
         "smartphone", "android", "iphone", "samsung", "redmi", "realme",
         "oppo", "vivo", "whatsapp"  # WhatsApp implies smartphone
     ])
 
-    data["uses_upi_basic"] = text_contains_any(text, [
+    data["uses_upi_basic"] = text_contains_any(view, [
         "upi", "phonepe", "gpay", "google pay", "paytm", "bhim",
         "digital payment", "online payment", "qr code"
     ])
 
-    recharge_amt = find_number_near(text, ["recharge", "plan"])
+    recharge_amt = find_number_near(view, ["recharge", "plan"])
     data["avg_monthly_recharge"] = min(recharge_amt or 249, 5000)
 
     return data
 
 
-def _extract_rental_data(text: str) -> Dict:
+def _extract_rental_data(text: Union[str, TextView]) -> Dict:
     """Extract rental discipline data."""
+    view = as_text_view(text)
+    text = view.raw
     data = {}
-    data["pays_rent"] = text_contains_any(text, [
+    data["pays_rent"] = text_contains_any(view, [
         "rent", "lease", "tenant", "rental", "house rent",
         "stall fee", "shop rent"
     ])
 
     if data["pays_rent"]:
-        rent_amounts = [a for a in find_amounts(text) if 500 <= a <= 50000]
+        rent_amounts = [a for a in view.amounts if 500 <= a <= 50000]
         data["rent_amount"] = rent_amounts[0] if rent_amounts else 2000
-        data["on_time_pct"] = find_percentage(text, ["on time", "timely"]) or 80
-        months = find_number_near(text, ["months", "month"])
+        data["on_time_pct"] = find_percentage(view, ["on time", "timely"]) or 80
+        months = find_number_near(view, ["months", "month"])
         data["months_of_history"] = int(min(months or 12, 240))
     else:
         data["rent_amount"] = 0
@@ -901,7 +1069,7 @@ _RELEVANT_KEYWORDS = [
 ]
 
 
-def check_document_relevance(text: str) -> Dict[str, Any]:
+def check_document_relevance(text: Union[str, TextView]) -> Dict[str, Any]:
     """
     Check whether uploaded document text is relevant for credit scoring.
 
@@ -913,8 +1081,9 @@ def check_document_relevance(text: str) -> Dict[str, Any]:
           - irrelevant_signals (list): matched irrelevant keywords
           - reason (str): human-readable explanation
     """
-    text_lower = text.lower()
-    word_count = len(text_lower.split())
+    view = as_text_view(text)
+    text_lower = view.lower
+    word_count = len(view.tokens)
 
     # Count matches
     relevant_matches = [kw for kw in _RELEVANT_KEYWORDS if kw in text_lower]
@@ -924,11 +1093,10 @@ def check_document_relevance(text: str) -> Dict[str, Any]:
     irrelevant_count = len(irrelevant_matches)
 
     # Check for monetary amounts (strong relevance signal)
-    amounts = find_amounts(text)
-    has_amounts = len(amounts) > 0
+    has_amounts = len(view.amounts) > 0
 
     # Check for dates (moderate relevance signal)
-    date_count = count_dates(text)
+    date_count = view.dates
 
     # Score calculation
     # Relevant signals boost the score, irrelevant signals reduce it
@@ -1082,8 +1250,11 @@ def analyze_documents(
         except Exception:
             merged_df = all_dfs[0]
 
+    # Tokenize the combined text once; every stage below shares this view
+    view = TextView.from_text(all_text)
+
     # ── Relevance check ────────────────────────────────────────────────
-    relevance = check_document_relevance(all_text)
+    relevance = check_document_relevance(view)
     if not relevance["is_relevant"]:
         return {
             "detected_persona": persona or "unknown",
@@ -1105,14 +1276,14 @@ def analyze_documents(
     # Auto-detect persona if not specified
     detect_confidence = 0.0
     if persona is None:
-        persona, detect_confidence = auto_detect_persona(all_text)
+        persona, detect_confidence = auto_detect_persona(view)
     else:
         detect_confidence = 0.95
 
         # ── Persona-document mismatch check ────────────────────────────
         # Even when user explicitly selected a persona, verify the
         # uploaded documents actually belong to that persona category.
-        detected_persona, detected_conf = auto_detect_persona(all_text)
+        detected_persona, detected_conf = auto_detect_persona(view)
         if (
             detected_persona != persona
             and detected_conf >= 0.15           # auto-detect is reasonably sure
@@ -1120,7 +1291,7 @@ def analyze_documents(
         ):
             # Double-check: does the document have ANY keywords for the
             # selected persona?  If yes at decent level, allow it.
-            text_lower = all_text.lower()
+            text_lower = view.lower
             selected_kws = PERSONA_KEYWORDS.get(persona, [])
             selected_hits = sum(1 for kw in selected_kws if kw in text_lower)
             selected_ratio = selected_hits / len(selected_kws) if selected_kws else 0
@@ -1166,7 +1337,7 @@ def analyze_documents(
 
     # Extract data using persona-specific extractor (regex-based)
     extractor = PERSONA_EXTRACTORS.get(persona, extract_general_data)
-    extracted_data = extractor(all_text, merged_df)
+    extracted_data = extractor(view, merged_df)
 
     # Merge structured data from document parsers (OCR engine)
     try:
@@ -7,21 +7,77 @@ import numpy as np
 import pandas as pd
 import json
 
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit: kernels run as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+
+
+def _loads_incomes(value: str) -> list:
+    """Decode a JSON-encoded monthly income list (orjson when installed)."""
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(value)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN literals, which only the stdlib parser accepts
+    return json.loads(value)
+
+
+def parse_income_series(values) -> list:
+    """
+    Parse a column of monthly income lists (JSON strings or sequences)
+    into float64 arrays in a single pass.
+    """
+    return [
+        np.asarray(_loads_incomes(v) if isinstance(v, str) else v, dtype=np.float64)
+        for v in values
+    ]
+
+
+@njit(cache=True)
+def _slope1d(y):
+    """
+    Closed-form OLS slope of `y` against 0..len(y)-1: cov(x, y) / var(x).
+    Same result as np.polyfit(range(len(y)), y, 1)[0] without the
+    Vandermonde/LAPACK solve; 0.0 for fewer than two points.
+    """
+    x = np.arange(y.shape[0]).astype(np.float64)
+    dx = x - x.mean()
+    denom = (dx * dx).sum()
+    if denom == 0.0:
+        return 0.0
+    return (dx * (y - y.mean())).sum() / denom
+
 
 # ─── A. Income Stability Index ──────────────────────────────────────────────
-def income_stability_index(monthly_incomes: list) -> dict:
+def income_stability_index(monthly_incomes) -> dict:
     """
     Measures how stable the user's income is.
     Returns stability score (0-1) and income trend (slope).
+    Accepts a list or a float64 array (used as-is, without copying).
     """
-    arr = np.array(monthly_incomes, dtype=float)
+    arr = np.asarray(monthly_incomes, dtype=np.float64)
     mean_inc = arr.mean()
     std_inc = arr.std()
     stability = 1 - (std_inc / (mean_inc + 1e-9))
     stability = np.clip(stability, 0, 1)
 
     # Income trend via linear regression slope
-    slope = np.polyfit(range(len(arr)), arr, 1)[0]
+    slope = _slope1d(arr)
     # Normalize trend: positive = growing
     trend_norm = np.clip(slope / (mean_inc + 1e-9), -1, 1)
 
@@ -33,6 +89,36 @@ def income_stability_index(monthly_incomes: list) -> dict:
     }
 
 
+def income_stability_batch(incomes: np.ndarray) -> dict:
+    """
+    Vectorized income_stability_index for an (n_users, n_months) matrix.
+
+    All users share the same month axis, so the OLS slope reduces to
+    cov(x, y) / var(x) and is computed for every user in one pass instead
+    of one slope fit per user. Returns unrounded arrays.
+    """
+    n_months = incomes.shape[1]
+    mean_inc = incomes.mean(axis=1)
+    std_inc = incomes.std(axis=1)
+    stability = np.clip(1 - std_inc / (mean_inc + 1e-9), 0, 1)
+
+    x = np.arange(n_months, dtype=np.float64)
+    x_centered = x - x.mean()
+    denom = (x_centered ** 2).sum()
+    if denom > 0:
+        slope = ((incomes - mean_inc[:, None]) * x_centered).sum(axis=1) / denom
+    else:
+        slope = np.zeros(len(incomes))
+    trend = np.clip(slope / (mean_inc + 1e-9), -1, 1)
+
+    return {
+        "stability_score": stability,
+        "income_trend": trend,
+        "mean_income": mean_inc,
+        "income_std": std_inc,
+    }
+
+
 # ─── B. Cash Flow Health Ratio ──────────────────────────────────────────────
 def cash_flow_health_ratio(net_income: float, fixed_expenses: float) -> dict:
     """
@@ -185,7 +271,91 @@ def platform_tenure_rating(tenure_months: int, rating: float,
 
 
 # ─── J. Shock Recovery Score ───────────────────────────────────────────────
-def shock_recovery(monthly_incomes: list) -> dict:
+@njit(cache=True)
+def _shock_recovery_core(arr):
+    """
+    Compiled shock scan for one income series.
+
+    Returns (num_shocks, months, ratios, recovery_months, recovered,
+    completeness, resilience); the per-shock arrays are valid up to
+    num_shocks. See shock_recovery() for the scoring rules.
+    """
+    n = arr.shape[0]
+    months = np.empty(n, dtype=np.int64)
+    ratios = np.empty(n, dtype=np.float64)
+    recovery = np.empty(n, dtype=np.int64)
+    recovered = np.zeros(n, dtype=np.bool_)
+    completeness = np.empty(n, dtype=np.float64)
+
+    k = 0
+    for i in range(1, n):
+        prev = arr[i - 1] + 1e-9
+        ratio = arr[i] / prev
+        if ratio < 0.85:  # any drop >15%
+            # Measure recovery from this dip
+            rec_months = 0
+            rec = False
+            for j in range(i + 1, n):
+                rec_months += 1
+                if arr[j] >= arr[i - 1] * 0.9:
+                    rec = True
+                    break
+            if not rec and i + 1 < n:
+                rec_months = n - i  # still recovering
+
+            comp = np.max(arr[i:]) / prev
+            if comp > 1.0:
+                comp = 1.0
+
+            months[k] = i
+            ratios[k] = ratio
+            recovery[k] = rec_months
+            recovered[k] = rec
+            completeness[k] = comp
+            k += 1
+
+    if k == 0:
+        # Never faced a shock → unverified resilience
+        return k, months, ratios, recovery, recovered, completeness, 0.85
+
+    # Speed score: inverse of avg recovery time
+    speed_score = 1.0 - recovery[:k].mean() / n
+    if speed_score < 0.0:
+        speed_score = 0.0
+
+    # Completeness: avg recovery completeness
+    completeness_score = completeness[:k].mean()
+
+    # Trajectory: OLS slope of income after the last shock
+    last_shock = months[k - 1]
+    if last_shock < n - 1:
+        slope = _slope1d(arr[last_shock:])
+        trajectory_score = slope / (arr.mean() + 1e-9) + 0.5
+        if trajectory_score < 0.0:
+            trajectory_score = 0.0
+        elif trajectory_score > 1.0:
+            trajectory_score = 1.0
+    else:
+        trajectory_score = 0.3
+
+    resilience = (
+        0.40 * speed_score
+        + 0.35 * completeness_score
+        + 0.25 * trajectory_score
+    )
+    return k, months, ratios, recovery, recovered, completeness, resilience
+
+
+@njit(cache=True, parallel=True)
+def _shock_resilience_batch(incomes):
+    """Unrounded resilience for every row of an (n_users, n_months) matrix."""
+    out = np.empty(incomes.shape[0], dtype=np.float64)
+    for u in prange(incomes.shape[0]):
+        out[u] = _shock_recovery_core(incomes[u])[6]
+    return out
+
+
+def shock_recovery(monthly_incomes) -> dict:
     """
     Enhanced shock recovery: detects ALL income dips (>15%),
     grades severity, and measures recovery speed, completeness,
@@ -198,75 +368,29 @@ def shock_recovery(monthly_incomes: list) -> dict:
 
     No shock ever → 0.85 (unverified resilience, not 1.0).
     Survived shock + fast recovery → up to 1.0 (proven resilience).
+    Accepts a list or a float64 array (used as-is, without copying).
     """
-    arr = np.array(monthly_incomes, dtype=float)
-    n = len(arr)
+    arr = np.asarray(monthly_incomes, dtype=np.float64)
+    k, months, ratios, recovery, recovered, completeness, resilience = \
+        _shock_recovery_core(arr)
 
-    # Detect ALL shocks (not just the first)
     shocks = []
-    for i in range(1, n):
-        ratio = arr[i] / (arr[i - 1] + 1e-9)
-        if ratio < 0.85:  # any drop >15%
-            if ratio < 0.5:
-                severity = "severe"
-            elif ratio < 0.7:
-                severity = "moderate"
-            else:
-                severity = "mild"
-
-            # Measure recovery from this dip
-            recovery_months = 0
-            recovered = False
-            for j in range(i + 1, n):
-                recovery_months += 1
-                if arr[j] >= arr[i - 1] * 0.9:
-                    recovered = True
-                    break
-            if not recovered and i + 1 < n:
-                recovery_months = n - i  # still recovering
-
-            completeness = float(
-                min(arr[i:].max() / (arr[i - 1] + 1e-9), 1.0)
-            )
-
-            shocks.append({
-                "month": i,
-                "drop_pct": round((1 - ratio) * 100, 1),
-                "severity": severity,
-                "recovery_months": recovery_months,
-                "recovered": recovered,
-                "completeness": completeness,
-            })
-
-    if shocks:
-        # Speed score: inverse of avg recovery time
-        avg_recovery = np.mean([s["recovery_months"] for s in shocks])
-        speed_score = max(0, 1 - avg_recovery / n)
-
-        # Completeness: avg recovery completeness
-        completeness_score = float(
-            np.mean([s["completeness"] for s in shocks])
-        )
-
-        # Trajectory: income slope after last shock
-        last_shock = shocks[-1]["month"]
-        if last_shock < n - 1:
-            post_shock = arr[last_shock:]
-            slope = np.polyfit(range(len(post_shock)), post_shock, 1)[0]
-            trajectory_score = float(
-                np.clip(slope / (arr.mean() + 1e-9) + 0.5, 0, 1)
-            )
+    for s in range(k):
+        ratio = ratios[s]
+        if ratio < 0.5:
+            severity = "severe"
+        elif ratio < 0.7:
+            severity = "moderate"
         else:
-            trajectory_score = 0.3
-
-        resilience = (
-            0.40 * speed_score
-            + 0.35 * completeness_score
-            + 0.25 * trajectory_score
-        )
-    else:
-        # Never faced a shock → unverified resilience
-        resilience = 0.85
+            severity = "mild"
+        shocks.append({
+            "month": int(months[s]),
+            "drop_pct": round((1 - ratio) * 100, 1),
+            "severity": severity,
+            "recovery_months": int(recovery[s]),
+            "recovered": bool(recovered[s]),
+            "completeness": float(completeness[s]),
+        })
 
     return {
         "had_shock": len(shocks) > 0,
@@ -279,10 +403,13 @@ def shock_recovery(monthly_incomes: list) -> dict:
 # ─── Master Feature Extractor ──────────────────────────────────────────────
 def extract_all_features(row: pd.Series) -> dict:
     """
-    Given a single row from the dataset, compute all feature scores.
+    Given a single row from the dataset (or a profile dict with the same
+    keys), compute all feature scores.
     Returns a flat dictionary of all engineered features.
     """
-    monthly_incomes = json.loads(row["monthly_incomes"]) if isinstance(row["monthly_incomes"], str) else row["monthly_incomes"]
+    # One conversion up front instead of a Series lookup per field
+    row = row.to_dict() if isinstance(row, pd.Series) else row
+    monthly_incomes = parse_income_series([row["monthly_incomes"]])[0]
 
     # A. Income Stability
     inc_stab = income_stability_index(monthly_incomes)
@@ -353,10 +480,104 @@ def extract_all_features(row: pd.Series) -> dict:
     }
 
 
+def _round4(values) -> list:
+    """
+    Round an array to 4 places with Python's round(), as the per-user
+    scorers do. np.round scales by 10**4 before rounding, so it can land
+    one unit off in the last place (e.g. 0.678 where round() gives 0.6781).
+    """
+    return [round(v, 4) for v in np.asarray(values, dtype=np.float64).tolist()]
+
+
 def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Apply feature engineering to entire DataFrame.
     Returns DataFrame with all engineered feature columns added.
+
+    Features B–I are O(1) arithmetic per user, so they are computed
+    column-wise over NumPy arrays rather than row-by-row through
+    extract_all_features. A and J depend on each user's variable-length
+    income series and stay on the per-user path.
     """
-    features = df.apply(extract_all_features, axis=1, result_type="expand")
+    def col(name):
+        return df[name].to_numpy(dtype=np.float64)
+
+    mean_income = col("mean_income")
+
+    # A / J. Per-user income-series features (parsed once for the column)
+    incomes = parse_income_series(df["monthly_incomes"].tolist())
+    if incomes and len({len(m) for m in incomes}) == 1:
+        # Equal-length histories: batch A and J over the (n, T) matrix
+        matrix = np.vstack(incomes)
+        stab = income_stability_batch(matrix)
+        stability = _round4(stab["stability_score"])
+        trend = _round4(stab["income_trend"])
+        resilience = _round4(np.clip(_shock_resilience_batch(matrix), 0, 1))
+    else:
+        inc_stab = [income_stability_index(m) for m in incomes]
+        stability = [s["stability_score"] for s in inc_stab]
+        trend = [s["income_trend"] for s in inc_stab]
+        resilience = [shock_recovery(m)["resilience_score"] for m in incomes]
+
+    # B. Cash Flow Health
+    cf_ratio = np.clip((mean_income - col("fixed_expenses")) / (mean_income + 1e-9), 0, 1)
+    cf_category = np.where(cf_ratio > 0.4, "Strong",
+                           np.where(cf_ratio >= 0.2, "Moderate", "Risk"))
+
+    # C. Income Diversity
+    diversity = np.minimum(col("num_income_sources") / 5, 1.0)
+
+    # D. Utility Timeliness
+    on_time_rate = col("on_time_payments") / (col("total_bills") + 1e-9)
+    utility = np.maximum(on_time_rate - 0.02 * col("avg_delay_days"), 0)
+
+    # E. EMI Pattern
+    emi = (np.minimum(col("recurring_payments_detected") / 5, 1.0) * 0.5
+           + col("emi_consistency_score") * 0.5)
+
+    # F. Transaction Regularity
+    txn = (col("txn_regularity_score") * 0.7
+           + np.minimum(col("total_transactions") / 150, 1.0) * 0.3)
+
+    # G. Expense Categorization
+    essential_ratio = col("essential_ratio")
+    expense_risk = np.where(essential_ratio >= 0.65, "Low",
+                            np.where(essential_ratio >= 0.45, "Medium", "High"))
+
+    # H. Savings Behavior
+    savings_rate = np.clip(col("avg_monthly_savings") / (mean_income + 1e-9), 0, 1)
+    savings = (0.3 * df["has_recurring_savings"].to_numpy().astype(bool)
+               + 0.3 * df["min_balance_maintained"].to_numpy().astype(bool)
+               + 0.4 * savings_rate)
+
+    # I. Platform Tenure & Rating
+    work = (np.minimum(col("tenure_months") / 48, 1.0) * 0.35
+            + col("platform_rating") / 5.0 * 0.40
+            + np.minimum(col("active_days_per_month") / 30, 1.0) * 0.25)
+
+    features = pd.DataFrame({
+        # A
+        "feat_income_stability": stability,
+        "feat_income_trend": trend,
+        # B
+        "feat_cash_flow_ratio": _round4(cf_ratio),
+        "feat_cash_flow_category": cf_category.astype(object),
+        # C
+        "feat_income_diversity": _round4(diversity),
+        # D
+        "feat_utility_score": _round4(utility),
+        # E
+        "feat_emi_score": _round4(emi),
+        # F
+        "feat_txn_regularity": _round4(txn),
+        # G
+        "feat_expense_score": _round4(np.clip(essential_ratio, 0, 1)),
+        "feat_expense_risk": expense_risk.astype(object),
+        # H
+        "feat_savings_score": _round4(savings),
+        # I
+        "feat_work_reliability": _round4(work),
+        # J
+        "feat_shock_recovery": resilience,
+    }, index=df.index)
     return pd.concat([df, features], axis=1)
@@ -14,10 +14,36 @@ Maps trust score + financial profile → eligible loan products with:
 Supports two pathways:
   1. Transaction-based (Upload & Score) — verified income, precise FOIR
   2. Alternative profile-based (Alternative Score) — persona-specific schemes
+
+Performance: a recommendation call is compute/interpreter-bound, not
+memory-bound (the catalog is a few dozen products and fits in cache), so
+SIMD/GPU work has nothing to parallelize. scripts/profile_loan_engine.py
+profiles both recommenders and lists the hottest functions; per-product
+pricing is scalar and memoized, so the detail builders usually lead.
+Re-run it against the parent commit before keeping a change here.
 """
 
-import math
-from typing import Dict, List, Any, Optional
+import bisect
+import heapq
+import re
+import sys
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit: kernels run as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 
 # ─── Score-Based Tier System ─────────────────────────────────────────────────
@@ -684,8 +710,230 @@ PERSONA_LOANS = {
 }
 
 
+def _intern_catalog():
+    """
+    Share one object per distinct catalog string and per distinct
+    lenders/documents list: strings are interned, and the lists become
+    tuples canonicalized through a lookup table so products with the same
+    lenders or documents point at the same tuple.
+    """
+    canonical = {}
+    for catalog in (TRANSACTION_LOANS, *PERSONA_LOANS.values()):
+        for loan in catalog.values():
+            for field in ("name", "icon", "category", "processing_fee",
+                          "description", "subsidy"):
+                if isinstance(loan.get(field), str):
+                    loan[field] = sys.intern(loan[field])
+            for field in ("lenders", "documents"):
+                items = tuple(sys.intern(x) for x in loan[field])
+                loan[field] = canonical.setdefault(items, items)
+
+
+_intern_catalog()
+
+
+class LoanProduct(NamedTuple):
+    """Immutable record of one catalog product (built from the dicts above)."""
+    key: str
+    name: str
+    icon: str
+    category: str
+    min_score: int
+    min_income: int
+    amount_range: Tuple[int, int]
+    interest_range: Tuple[float, float]
+    tenure_range: Tuple[int, int]
+    collateral: bool
+    processing_fee: str
+    description: str
+    lenders: Tuple[str, ...]
+    documents: Tuple[str, ...]
+    subsidy: Optional[str]
+    eligibility_criteria: Tuple[str, ...] = ()
+    band_rates: Tuple[float, ...] = ()
+    band_rates_2dp: Tuple[float, ...] = ()
+
+
+# Score bands for rate pricing: cutoffs (highest first) and how far up the
+# product's interest range each band is priced (0 = lowest rate). A score
+# below every cutoff falls in the last band.
+_TRANSACTION_RATE_CUTOFFS = (750, 650, 500)
+_TRANSACTION_RATE_BLENDS = (0.0, 0.3, 0.6, 1.0)
+_PERSONA_RATE_CUTOFFS = (700, 550)
+_PERSONA_RATE_BLENDS = (0.0, 0.4, 1.0)
+
+
+def _rate_band(score: float, cutoffs: Tuple[int, ...]) -> int:
+    """Index of the first rate band whose cutoff the score reaches."""
+    return next((i for i, cutoff in enumerate(cutoffs) if score >= cutoff), len(cutoffs))
+
+
+def _band_rate(interest_range, blend: float) -> float:
+    """Effective interest rate `blend` of the way up a product's range."""
+    low, high = interest_range
+    if blend == 0.0:
+        return low
+    if blend == 1.0:
+        return high
+    return low + (high - low) * blend
+
+
+def _band_rates(interest_range, blends: Tuple[float, ...]) -> Tuple[float, ...]:
+    """Effective interest rate of a product in each score band."""
+    return tuple(_band_rate(interest_range, blend) for blend in blends)
+
+
+def _loan_product(key: str, loan: Dict, rate_blends: Tuple[float, ...]) -> LoanProduct:
+    band_rates = _band_rates(loan["interest_range"], rate_blends)
+    return LoanProduct(
+        key=key,
+        name=loan["name"],
+        icon=loan["icon"],
+        category=loan["category"],
+        min_score=loan["min_score"],
+        min_income=loan.get("min_income", 0),
+        amount_range=tuple(loan["amount_range"]),
+        interest_range=tuple(loan["interest_range"]),
+        tenure_range=tuple(loan["tenure_range"]),
+        collateral=loan.get("collateral", False),
+        processing_fee=loan["processing_fee"],
+        description=loan["description"],
+        lenders=tuple(loan["lenders"]),
+        documents=tuple(loan["documents"]),
+        subsidy=loan.get("subsidy"),
+        eligibility_criteria=tuple(loan.get("eligibility_criteria", ())),
+        band_rates=band_rates,
+        band_rates_2dp=tuple(round(rate, 2) for rate in band_rates),
+    )
+
+
+# Frozen views of the catalogs used by the recommendation pipelines.
+# TRANSACTION_LOANS / PERSONA_LOANS remain the public, dict-based catalogs.
+_TRANSACTION_PRODUCTS = tuple(
+    _loan_product(key, loan, _TRANSACTION_RATE_BLENDS)
+    for key, loan in TRANSACTION_LOANS.items()
+)
+_PERSONA_PRODUCTS = {
+    persona: tuple(_loan_product(key, loan, _PERSONA_RATE_BLENDS)
+                   for key, loan in loans.items())
+    for persona, loans in PERSONA_LOANS.items()
+}
+
+
+# ─── Columnar Catalog View ──────────────────────────────────────────────────
+
+def _build_loan_table():
+    """
+    Flatten both catalogs into parallel NumPy columns (one row per product,
+    transaction loans first, then each persona's loans in catalog order)
+    so numeric filters run as array masks instead of per-dict lookups.
+    Returns (columns, rows); rows[i] is (source, persona, key, loan) for
+    row i.
+    """
+    rows = [("transaction", None, key, loan) for key, loan in TRANSACTION_LOANS.items()]
+    for persona_key, persona_loans in PERSONA_LOANS.items():
+        rows.extend(("persona", persona_key, key, loan) for key, loan in persona_loans.items())
+
+    n = len(rows)
+    table = {
+        "amt_lo": np.empty(n, dtype=np.int64),
+        "amt_hi": np.empty(n, dtype=np.int64),
+        "rate_lo": np.empty(n, dtype=np.float64),
+        "rate_hi": np.empty(n, dtype=np.float64),
+        "tenure_lo": np.empty(n, dtype=np.int32),
+        "tenure_hi": np.empty(n, dtype=np.int32),
+        "collateral": np.empty(n, dtype=np.bool_),
+        "has_subsidy": np.empty(n, dtype=np.bool_),
+        "source": np.empty(n, dtype=object),
+        "persona": np.empty(n, dtype=object),
+        "id": np.empty(n, dtype=object),
+    }
+    for i, (source, persona, key, loan) in enumerate(rows):
+        table["amt_lo"][i], table["amt_hi"][i] = loan.get("amount_range", (0, 0))
+        table["rate_lo"][i], table["rate_hi"][i] = loan.get("interest_range", (0, 0))
+        table["tenure_lo"][i], table["tenure_hi"][i] = loan.get("tenure_range", (0, 0))
+        table["collateral"][i] = bool(loan.get("collateral", False))
+        table["has_subsidy"][i] = bool(loan.get("subsidy"))
+        table["source"][i] = source
+        table["persona"][i] = persona
+        table["id"][i] = key
+    return table, rows
+
+
+_LOAN_TABLE, _LOAN_ROWS = _build_loan_table()
+
+
 # ─── EMI Calculator ─────────────────────────────────────────────────────────
 
+@njit(cache=True)
+def _emi_scalar(principal, annual_rate, tenure_months):
+    """Unrounded EMI for a positive principal, rate and tenure."""
+    r = annual_rate / (12 * 100)  # monthly rate
+    f = (1.0 + r) ** tenure_months
+    return principal * r * f / (f - 1.0)
+
+
+@njit(cache=True)
+def _emi_batch_kernel(principals, annual_rates, tenures, out):
+    """Unrounded EMIs of aligned 1-D float64 arrays into `out` (same guards as calculate_emi)."""
+    for i in range(principals.shape[0]):
+        p = principals[i]
+        n = tenures[i]
+        if p <= 0 or n <= 0:
+            out[i] = 0.0
+        elif annual_rates[i] <= 0:
+            out[i] = p / n
+        else:
+            out[i] = _emi_scalar(p, annual_rates[i], n)
+
+
+@njit(cache=True)
+def _amortize(principal, r, emi, n):
+    """
+    Month-by-month (principal, interest, balance) components of an EMI
+    loan, as three float64 arrays of length n; the balance floors at 0.
+    """
+    principal_part = np.empty(n, dtype=np.float64)
+    interest = np.empty(n, dtype=np.float64)
+    balance_out = np.empty(n, dtype=np.float64)
+    balance = principal
+    for i in range(n):
+        interest_component = balance * r
+        principal_component = emi - interest_component
+        balance = max(balance - principal_component, 0.0)
+        principal_part[i] = principal_component
+        interest[i] = interest_component
+        balance_out[i] = balance
+    return principal_part, interest, balance_out
+
+
+# Without numba the kernels above run as plain Python; use the compiled
+# Cython kernels from src/_emi.pyx instead when they have been built
+# (python setup.py build_ext --inplace). Same signatures, same results.
+if not _NUMBA_AVAILABLE:
+    try:
+        from src._emi import emi as _emi_scalar, emi_batch as _emi_batch_kernel
+    except ImportError:
+        pass
+
+
+def calculate_emi_batch(principals, annual_rates, tenures) -> np.ndarray:
+    """
+    calculate_emi over float64 arrays in one compiled loop; the inputs
+    broadcast together like NumPy operands. Returns unrounded EMIs (same
+    guards as calculate_emi) in the broadcast shape.
+    """
+    p, r, n = np.broadcast_arrays(
+        np.asarray(principals, dtype=np.float64),
+        np.asarray(annual_rates, dtype=np.float64),
+        np.asarray(tenures, dtype=np.float64),
+    )
+    out = np.empty(p.shape, dtype=np.float64)
+    _emi_batch_kernel(np.ascontiguousarray(p).ravel(), np.ascontiguousarray(r).ravel(),
+                      np.ascontiguousarray(n).ravel(), out.reshape(-1))
+    return out
+
+
 def calculate_emi(principal: float, annual_rate: float,
                   tenure_months: int) -> float:
     """
@@ -696,27 +944,209 @@ def calculate_emi(principal: float, annual_rate: float,
         return 0.0
     if annual_rate <= 0:
         return principal / tenure_months
+    return _emi_paise(principal, annual_rate, tenure_months) / 100
 
-    r = annual_rate / (12 * 100)  # monthly rate
-    n = tenure_months
-    emi = principal * r * math.pow(1 + r, n) / (math.pow(1 + r, n) - 1)
-    return round(emi, 2)
+
+def _to_paise(amount: float) -> int:
+    """Non-negative rupee amount as a whole number of paise (half rounds up)."""
+    return int(amount * 100 + 0.5)
+
+
+@lru_cache(maxsize=4096)
+def _emi_paise(principal: float, annual_rate: float, tenure_months: int) -> int:
+    """
+    EMI in whole paise for a positive principal, rate and tenure, memoized
+    on the exact arguments (requests repeat the same few catalog amounts/rates).
+    """
+    factor = _EMI_FACTOR.get((annual_rate, tenure_months))
+    if factor is not None:
+        return _to_paise(principal * factor)
+
+    return _to_paise(_emi_scalar(float(principal), float(annual_rate),
+                                 float(tenure_months)))
+
+
+def calculate_emi_vec(principals, annual_rates, tenures) -> np.ndarray:
+    """
+    calculate_emi over whole arrays (e.g. every product in a catalog) with
+    NumPy broadcasting. Same guards and rounding as calculate_emi: 0 for a
+    non-positive principal or tenure, unrounded P/n at a zero rate, else
+    whole paise.
+    """
+    p = np.asarray(principals, dtype=np.float64)
+    rate = np.asarray(annual_rates, dtype=np.float64)
+    n = np.asarray(tenures, dtype=np.float64)
+
+    r = rate / (12 * 100)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        f = np.power(1 + r, n)
+        emi = np.where(rate <= 0, p / n,
+                       np.floor(p * r * f / (f - 1) * 100 + 0.5) / 100)
+    return np.where((p <= 0) | (n <= 0), 0.0, emi)
 
 
+@lru_cache(maxsize=4096)
 def calculate_total_interest(principal: float, annual_rate: float,
                              tenure_months: int) -> float:
     """Total interest payable over the loan tenure."""
+    if principal > 0 and tenure_months > 0 and annual_rate > 0:
+        # Whole-paise EMI: the total is exact integer arithmetic
+        emi_paise = _emi_paise(principal, annual_rate, tenure_months)
+        return (emi_paise * tenure_months - _to_paise(principal)) / 100
     emi = calculate_emi(principal, annual_rate, tenure_months)
     total_paid = emi * tenure_months
     return round(total_paid - principal, 2)
 
 
+def calculate_total_interest_vec(principals, annual_rates, tenures) -> np.ndarray:
+    """
+    calculate_total_interest over whole arrays, from one calculate_emi_vec
+    pass. Priced (positive-rate) loans use the same whole-paise arithmetic
+    as the scalar version.
+    """
+    p = np.asarray(principals, dtype=np.float64)
+    rate = np.asarray(annual_rates, dtype=np.float64)
+    n = np.asarray(tenures, dtype=np.float64)
+    return _interest_from_emi_vec(p, rate, n, calculate_emi_vec(p, rate, n))
+
+
+def _interest_from_emi_vec(p: np.ndarray, rate: np.ndarray, n: np.ndarray,
+                           emi: np.ndarray) -> np.ndarray:
+    """Total interest for float64 loan arrays whose EMIs are already known."""
+    priced = (p > 0) & (n > 0) & (rate > 0)
+    with np.errstate(invalid="ignore"):
+        out = (np.floor(emi * 100 + 0.5) * n - np.floor(p * 100 + 0.5)) / 100
+    if not isinstance(out, np.ndarray) or out.shape != priced.shape:
+        out = np.broadcast_to(out, priced.shape).copy()
+    if not priced.all():
+        # Unpriced loans (zero rate/tenure) are rare; round them exactly
+        # like the scalar path rather than with np.round's half-way error
+        rest = ~priced
+        unpriced = np.broadcast_to(emi * n - p, priced.shape)[rest]
+        out[rest] = [round(x, 2) for x in unpriced.tolist()]
+    return out
+
+
+def _build_emi_factor_table() -> Dict:
+    """
+    EMI per rupee of principal, r(1+r)^n / ((1+r)^n - 1), for every
+    (rate, tenure) pair the catalogs and score tiers can produce directly:
+    interest/tenure range endpoints and tier tenure caps. Keys are the exact
+    catalog values, so calculate_emi only hits the table for those rates;
+    interpolated or ad-hoc rates take the formula path.
+    """
+    products = list(TRANSACTION_LOANS.values())
+    for persona_loans in PERSONA_LOANS.values():
+        products.extend(persona_loans.values())
+
+    rates, tenures = set(), set()
+    for loan in products:
+        rates.update(loan["interest_range"])
+        tenures.update(loan["tenure_range"])
+    for tier in SCORE_TIERS.values():
+        rates.update(tier["base_interest_range"])
+        tenures.add(tier["max_tenure_months"])
+
+    return {
+        (rate, n): _emi_scalar(1.0, float(rate), float(n))
+        for rate in rates if rate > 0
+        for n in tenures if n > 0
+    }
+
+
+_EMI_FACTOR = _build_emi_factor_table()
+
 # ─── Repayment Capacity Analysis ────────────────────────────────────────────
 
-def analyze_repayment_capacity(monthly_income: float,
-                               monthly_expenses: float = 0,
-                               existing_emi: float = 0,
-                               foir_cap: float = 0.40) -> Dict:
+# Risk flag bits set by _foir_core; bit i is described by _FLAG_STRINGS[i]
+_FLAG_OVER_LEVERAGED = 1 << 0
+_FLAG_FOIR_EXCEEDED = 1 << 1
+_FLAG_LOW_DISPOSABLE = 1 << 2
+_FLAG_LIMITED_CAPACITY = 1 << 3
+_FLAG_ZERO_INCOME = 1 << 4
+
+_FLAG_STRINGS = (
+    "Over-leveraged: Existing EMIs exceed 50% of income",
+    "FOIR exceeded: {current_foir:.0%} > {foir_cap:.0%} limit",
+    "Low disposable income: Less than 20% of earnings remain",
+    "Very limited new EMI capacity",
+    "Zero or negative income detected",
+)
+
+
+@njit(cache=True)
+def _foir_core(income, expenses, existing_emi, foir_cap):
+    """
+    Numeric core of analyze_repayment_capacity for a positive income.
+    Returns (disposable, max_total_emi, max_new_emi, current_foir,
+    headroom, flags) with risk flags as a bitmask.
+    """
+    disposable = income - expenses
+    max_total_emi = income * foir_cap
+    max_new_emi = max(max_total_emi - existing_emi, 0.0)
+    current_foir = existing_emi / income
+    headroom = max(foir_cap - current_foir, 0.0)
+
+    flags = 0
+    if current_foir > 0.50:
+        flags |= _FLAG_OVER_LEVERAGED
+    if current_foir > foir_cap:
+        flags |= _FLAG_FOIR_EXCEEDED
+    if disposable < income * 0.20:
+        flags |= _FLAG_LOW_DISPOSABLE
+    if existing_emi > 0 and max_new_emi < 1000:
+        flags |= _FLAG_LIMITED_CAPACITY
+    return disposable, max_total_emi, max_new_emi, current_foir, headroom, flags
+
+
+def decode_flags(bits: int, current_foir: float = 0.0,
+                 foir_cap: float = 0.0) -> List[str]:
+    """
+    Human-readable risk flags for a repayment risk bitmask; the FOIR
+    figures fill in the "FOIR exceeded" message.
+    """
+    if not bits:
+        return []
+    return [
+        text.format(current_foir=current_foir, foir_cap=foir_cap)
+        for i, text in enumerate(_FLAG_STRINGS) if bits >> i & 1
+    ]
+
+
+class RepaymentCapacity(NamedTuple):
+    """FOIR-based repayment capacity of one applicant."""
+    monthly_income: float
+    monthly_expenses: float
+    existing_emi: float
+    disposable_income: float
+    max_total_emi: float
+    max_new_emi: float
+    current_foir: float
+    foir_limit: float
+    foir_headroom: float
+    flags: int
+    verdict: str
+    # Unrounded current_foir, so "FOIR exceeded" reads the exact percentage
+    foir_exact: float = 0.0
+
+    @property
+    def risk_flags(self) -> List[str]:
+        """Risk flags as messages, decoded from the bitmask on demand."""
+        return decode_flags(self.flags, self.foir_exact, self.foir_limit)
+
+    def as_dict(self) -> Dict:
+        """Plain dict in the shape embedded in recommendation payloads."""
+        out = self._asdict()
+        del out["flags"], out["verdict"], out["foir_exact"]
+        out["risk_flags"] = self.risk_flags
+        out["verdict"] = self.verdict
+        return out
+
+
+def repayment_capacity(monthly_income: float,
+                       monthly_expenses: float = 0,
+                       existing_emi: float = 0,
+                       foir_cap: float = 0.40) -> RepaymentCapacity:
     """
     Compute repayment capacity using FOIR (Fixed Obligation to Income Ratio).
     
@@ -727,61 +1157,63 @@ def analyze_repayment_capacity(monthly_income: float,
         foir_cap: Max fraction of income allowed for total EMIs (score-based)
     
     Returns:
-        Dict with max affordable EMI, FOIR, risk flags, etc.
+        RepaymentCapacity with max affordable EMI, FOIR, risk flags, etc.
     """
     if monthly_income <= 0:
-        return {
-            "monthly_income": 0,
-            "monthly_expenses": monthly_expenses,
-            "existing_emi": existing_emi,
-            "disposable_income": 0,
-            "max_total_emi": 0,
-            "max_new_emi": 0,
-            "current_foir": 0,
-            "foir_limit": foir_cap,
-            "foir_headroom": 0,
-            "risk_flags": ["Zero or negative income detected"],
-            "verdict": "NOT_ELIGIBLE",
-        }
-
-    disposable = monthly_income - monthly_expenses
-    max_total_emi = monthly_income * foir_cap
-    max_new_emi = max(max_total_emi - existing_emi, 0)
-    current_foir = (existing_emi / monthly_income) if monthly_income > 0 else 0
-    headroom = max(foir_cap - current_foir, 0)
+        return RepaymentCapacity(
+            monthly_income=0,
+            monthly_expenses=monthly_expenses,
+            existing_emi=existing_emi,
+            disposable_income=0,
+            max_total_emi=0,
+            max_new_emi=0,
+            current_foir=0,
+            foir_limit=foir_cap,
+            foir_headroom=0,
+            flags=_FLAG_ZERO_INCOME,
+            verdict="NOT_ELIGIBLE",
+        )
 
-    risk_flags = []
-    if current_foir > 0.50:
-        risk_flags.append("Over-leveraged: Existing EMIs exceed 50% of income")
-    if current_foir > foir_cap:
-        risk_flags.append(f"FOIR exceeded: {current_foir:.0%} > {foir_cap:.0%} limit")
-    if disposable < monthly_income * 0.20:
-        risk_flags.append("Low disposable income: Less than 20% of earnings remain")
-    if existing_emi > 0 and max_new_emi < 1000:
-        risk_flags.append("Very limited new EMI capacity")
+    disposable, max_total_emi, max_new_emi, current_foir, headroom, flags = _foir_core(
+        float(monthly_income), float(monthly_expenses), float(existing_emi), float(foir_cap)
+    )
 
     if max_new_emi <= 0:
         verdict = "NOT_ELIGIBLE"
     elif max_new_emi < 2000:
         verdict = "MICRO_ONLY"
-    elif len(risk_flags) > 0:
+    elif flags:
         verdict = "ELIGIBLE_WITH_CAUTION"
     else:
         verdict = "ELIGIBLE"
 
-    return {
-        "monthly_income": round(monthly_income, 2),
-        "monthly_expenses": round(monthly_expenses, 2),
-        "existing_emi": round(existing_emi, 2),
-        "disposable_income": round(disposable, 2),
-        "max_total_emi": round(max_total_emi, 2),
-        "max_new_emi": round(max_new_emi, 2),
-        "current_foir": round(current_foir, 4),
-        "foir_limit": foir_cap,
-        "foir_headroom": round(headroom, 4),
-        "risk_flags": risk_flags,
-        "verdict": verdict,
-    }
+    return RepaymentCapacity(
+        monthly_income=round(monthly_income, 2),
+        monthly_expenses=round(monthly_expenses, 2),
+        existing_emi=round(existing_emi, 2),
+        disposable_income=round(disposable, 2),
+        max_total_emi=round(max_total_emi, 2),
+        max_new_emi=round(max_new_emi, 2),
+        current_foir=round(current_foir, 4),
+        foir_limit=foir_cap,
+        foir_headroom=round(headroom, 4),
+        flags=int(flags),
+        verdict=verdict,
+        foir_exact=current_foir,
+    )
+
+
+def analyze_repayment_capacity(monthly_income: float,
+                               monthly_expenses: float = 0,
+                               existing_emi: float = 0,
+                               foir_cap: float = 0.40) -> Dict:
+    """
+    Dict form of repayment_capacity (max affordable EMI, FOIR, risk flags,
+    etc.) for callers that serialize or index the result by key.
+    """
+    return repayment_capacity(
+        monthly_income, monthly_expenses, existing_emi, foir_cap
+    ).as_dict()
 
 
 def max_loan_from_emi(max_emi: float, annual_rate: float,
@@ -797,20 +1229,60 @@ def max_loan_from_emi(max_emi: float, annual_rate: float,
 
     r = annual_rate / (12 * 100)
     n = tenure_months
-    principal = max_emi * (math.pow(1 + r, n) - 1) / (r * math.pow(1 + r, n))
+    f = (1.0 + r) ** n
+    principal = max_emi * (f - 1.0) / (r * f)
     return round(principal, 2)
 
 
+# Compile (or load from numba's on-disk cache) the kernels the recommenders
+# call, so the first request does not pay for it; the batch kernel is left
+# to compile lazily on first use
+try:
+    calculate_emi(100000, 12.0, 12)
+    _amortize(100000.0, 0.01, 8884.88, 12)
+    _foir_core(1.0, 0.0, 0.0, 0.4)
+except Exception:
+    pass  # fall back to compiling lazily on first use
+
+
 # ─── Score Tier Resolver ────────────────────────────────────────────────────
 
+# Tier ranges sorted by lower bound, derived from SCORE_TIERS; the extra
+# trailing key is the default for scores outside every range
+_TIER_KEYS = tuple(sorted(SCORE_TIERS, key=lambda k: SCORE_TIERS[k]["range"][0]))
+_TIER_LOWS = [SCORE_TIERS[k]["range"][0] for k in _TIER_KEYS]
+_TIER_HIGHS = [SCORE_TIERS[k]["range"][1] for k in _TIER_KEYS]
+_TIER_KEY_ARRAY = np.array(_TIER_KEYS + ("very_poor",), dtype=object)
+_TIER_LOW_EDGES = np.array(_TIER_LOWS, dtype=np.float64)
+_TIER_HIGH_EDGES = np.array(_TIER_HIGHS, dtype=np.float64)
+
+
+def tier_for(score):
+    """
+    Tier key for a trust score, by binary search over the tier ranges.
+    Scores outside every range (below 300, above 900 or in a gap between
+    integer ranges) map to "very_poor". Accepts a NumPy array of scores
+    and returns an array of keys.
+    """
+    if isinstance(score, np.ndarray):
+        idx = np.searchsorted(_TIER_LOW_EDGES, score, side="right") - 1
+        in_range = (idx >= 0) & (score <= _TIER_HIGH_EDGES[idx])
+        return _TIER_KEY_ARRAY[np.where(in_range, idx, len(_TIER_KEYS))]
+
+    idx = bisect.bisect_right(_TIER_LOWS, score) - 1
+    if idx >= 0 and score <= _TIER_HIGHS[idx]:
+        return _TIER_KEYS[idx]
+    return "very_poor"
+
+
+# Tier configs with their key merged in, built once; get_score_tier hands
+# out shallow copies so callers can keep mutating their result
+_TIER_CONFIGS = {key: {**tier, "tier_key": key} for key, tier in SCORE_TIERS.items()}
+
+
 def get_score_tier(score: float) -> Dict:
     """Return the tier config for a given trust score."""
-    for tier_key, tier in SCORE_TIERS.items():
-        low, high = tier["range"]
-        if low <= score <= high:
-            return {**tier, "tier_key": tier_key}
-    # Default: very poor
-    return {**SCORE_TIERS["very_poor"], "tier_key": "very_poor"}
+    return _TIER_CONFIGS[tier_for(score)].copy()
 
 
 # ─── Transaction-Based Recommendations ──────────────────────────────────────
@@ -836,30 +1308,28 @@ def get_transaction_loan_recommendations(
         Complete loan recommendation package
     """
     tier = get_score_tier(score)
-    repayment = analyze_repayment_capacity(
+    repayment = repayment_capacity(
         monthly_income, monthly_expenses, existing_emi, tier["foir_cap"]
     )
 
-    # Filter eligible loans
-    eligible_loans = []
-    ineligible_loans = []
+    rate_band = _rate_band(score, _TRANSACTION_RATE_CUTOFFS)
 
-    for loan_key, loan in TRANSACTION_LOANS.items():
+    # Filter eligible loans
+    details = []
+    for loan in _TRANSACTION_PRODUCTS:
         eligibility = _check_transaction_loan_eligibility(
             loan, score, monthly_income, tier, repayment
         )
 
-        loan_detail = _build_loan_detail(
-            loan_key, loan, score, monthly_income, tier, repayment, eligibility
-        )
+        details.append(_build_loan_detail(
+            loan, rate_band, monthly_income, tier, repayment, eligibility
+        ))
 
-        if eligibility["eligible"]:
-            eligible_loans.append(loan_detail)
-        else:
-            ineligible_loans.append(loan_detail)
+    eligible_loans = [d for d in details if d["eligible"]]
+    ineligible_loans = [d for d in details if not d["eligible"]]
 
     # Sort eligible by best fit (highest max amount first)
-    eligible_loans.sort(key=lambda x: x["max_loan_amount"], reverse=True)
+    eligible_loans.sort(key=itemgetter("max_loan_amount"), reverse=True)
 
     # Limit simultaneous loans
     max_loans = tier["max_simultaneous_loans"]
@@ -870,7 +1340,7 @@ def get_transaction_loan_recommendations(
     return {
         "score": score,
         "tier": tier,
-        "repayment_capacity": repayment,
+        "repayment_capacity": repayment.as_dict(),
         "eligible_loans": eligible_loans,
         "ineligible_loans": ineligible_loans,
         "max_simultaneous_loans": max_loans,
@@ -883,22 +1353,22 @@ def get_transaction_loan_recommendations(
 
 
 def _check_transaction_loan_eligibility(
-    loan: Dict, score: float, income: float,
-    tier: Dict, repayment: Dict
+    loan: LoanProduct, score: float, income: float,
+    tier: Dict, repayment: RepaymentCapacity
 ) -> Dict:
     """Check if user is eligible for a specific transaction-based loan."""
     reasons = []
     eligible = True
 
-    if score < loan["min_score"]:
+    if score < loan.min_score:
         eligible = False
-        reasons.append(f"Score {score:.0f} below minimum {loan['min_score']}")
+        reasons.append(f"Score {score:.0f} below minimum {loan.min_score}")
 
-    if income < loan["min_income"]:
+    if income < loan.min_income:
         eligible = False
-        reasons.append(f"Income ₹{income:,.0f} below minimum ₹{loan['min_income']:,}")
+        reasons.append(f"Income ₹{income:,.0f} below minimum ₹{loan.min_income:,}")
 
-    if repayment["verdict"] == "NOT_ELIGIBLE":
+    if repayment.verdict == "NOT_ELIGIBLE":
         eligible = False
         reasons.append("Repayment capacity insufficient")
 
@@ -910,34 +1380,25 @@ def _check_transaction_loan_eligibility(
 
 
 def _build_loan_detail(
-    loan_key: str, loan: Dict, score: float, income: float,
-    tier: Dict, repayment: Dict, eligibility: Dict
+    loan: LoanProduct, rate_band: int, income: float,
+    tier: Dict, repayment: RepaymentCapacity, eligibility: Dict
 ) -> Dict:
-    """Build detailed loan recommendation with EMI calculations."""
-    # Determine effective interest rate based on score
-    loan_rate_low, loan_rate_high = loan["interest_range"]
-    tier_rate_low, tier_rate_high = tier["base_interest_range"]
-
-    # Better score → closer to lower rate
-    if score >= 750:
-        effective_rate = loan_rate_low
-    elif score >= 650:
-        effective_rate = loan_rate_low + (loan_rate_high - loan_rate_low) * 0.3
-    elif score >= 500:
-        effective_rate = loan_rate_low + (loan_rate_high - loan_rate_low) * 0.6
-    else:
-        effective_rate = loan_rate_high
+    """Build detailed loan recommendation."""
+    # Better score → closer to lower rate (rate_band from
+    # _TRANSACTION_RATE_CUTOFFS)
+    effective_rate = loan.band_rates[rate_band]
+
+    min_amount, max_amount_by_product = loan.amount_range
+    tenure_low, tenure_high = loan.tenure_range
 
     # Determine max loan amount based on repayment capacity
     max_amount_by_income = income * tier["max_exposure_multiplier"]
-    max_amount_by_product = loan["amount_range"][1]
-    min_amount = loan["amount_range"][0]
 
-    if repayment["max_new_emi"] > 0:
+    if repayment.max_new_emi > 0:
         # Use mid-tenure for FOIR-based calculation
-        mid_tenure = (loan["tenure_range"][0] + loan["tenure_range"][1]) // 2
+        mid_tenure = (tenure_low + tenure_high) // 2
         max_amount_by_emi = max_loan_from_emi(
-            repayment["max_new_emi"], effective_rate, mid_tenure
+            repayment.max_new_emi, effective_rate, mid_tenure
         )
     else:
         max_amount_by_emi = 0
@@ -950,21 +1411,16 @@ def _build_loan_detail(
     recommended = max(recommended, 0)
 
     # EMI for recommended amount at suggested tenure
-    suggested_tenure = min(
-        loan["tenure_range"][1],
-        tier["max_tenure_months"]
-    )
-    if suggested_tenure == 0 and loan["tenure_range"][1] > 0:
-        suggested_tenure = loan["tenure_range"][0]
+    suggested_tenure = min(tenure_high, tier["max_tenure_months"])
+    if suggested_tenure == 0 and tenure_high > 0:
+        suggested_tenure = tenure_low
 
     emi = calculate_emi(recommended, effective_rate, suggested_tenure)
-    total_interest = calculate_total_interest(
-        recommended, effective_rate, suggested_tenure
-    )
+    total_interest = calculate_total_interest(recommended, effective_rate, suggested_tenure)
 
     # Interest saved via subsidy
     interest_saved = 0
-    if loan.get("subsidy"):
+    if loan.subsidy:
         # Rough estimate: subsidy saves ~3-5% interest
         market_interest = calculate_total_interest(
             recommended, effective_rate + 4, suggested_tenure
@@ -972,27 +1428,27 @@ def _build_loan_detail(
         interest_saved = max(market_interest - total_interest, 0)
 
     return {
-        "key": loan_key,
-        "name": loan["name"],
-        "icon": loan["icon"],
-        "category": loan["category"],
+        "key": loan.key,
+        "name": loan.name,
+        "icon": loan.icon,
+        "category": loan.category,
         "eligible": eligibility["eligible"],
         "reasons": eligibility.get("reasons", []),
-        "effective_rate": round(effective_rate, 2),
+        "effective_rate": loan.band_rates_2dp[rate_band],
         "max_loan_amount": round(max_loan, 0),
         "recommended_amount": round(recommended, 0),
         "min_amount": min_amount,
         "emi": emi,
         "suggested_tenure": suggested_tenure,
-        "tenure_range": loan["tenure_range"],
+        "tenure_range": loan.tenure_range,
         "total_interest": total_interest,
         "interest_saved_via_subsidy": round(interest_saved, 0),
-        "collateral_required": loan.get("collateral", False),
-        "processing_fee": loan["processing_fee"],
-        "description": loan["description"],
-        "lenders": loan["lenders"],
-        "documents": loan["documents"],
-        "subsidy": loan.get("subsidy"),
+        "collateral_required": loan.collateral,
+        "processing_fee": loan.processing_fee,
+        "description": loan.description,
+        "lenders": loan.lenders,
+        "documents": loan.documents,
+        "subsidy": loan.subsidy,
     }
 
 
@@ -1021,35 +1477,33 @@ def get_persona_loan_recommendations(
     persona_data = persona_data or {}
 
     # Get persona-specific loan catalog
-    persona_loan_catalog = PERSONA_LOANS.get(persona, PERSONA_LOANS["general_no_bank"])
+    persona_loan_catalog = _PERSONA_PRODUCTS.get(persona, _PERSONA_PRODUCTS["general_no_bank"])
 
     # Estimate income if not provided
     if monthly_income <= 0:
         monthly_income = _estimate_income_from_persona(persona, persona_data)
 
-    repayment = analyze_repayment_capacity(
+    repayment = repayment_capacity(
         monthly_income, 0, 0, tier["foir_cap"]
     )
 
-    eligible_loans = []
-    ineligible_loans = []
+    rate_band = _rate_band(score, _PERSONA_RATE_CUTOFFS)
 
-    for loan_key, loan in persona_loan_catalog.items():
+    details = []
+    for loan in persona_loan_catalog:
         eligibility = _check_persona_loan_eligibility(
             loan, score, persona_data, tier
         )
 
-        loan_detail = _build_persona_loan_detail(
-            loan_key, loan, score, monthly_income, tier, repayment, eligibility
-        )
+        details.append(_build_persona_loan_detail(
+            loan, rate_band, monthly_income, tier, repayment, eligibility
+        ))
 
-        if eligibility["eligible"]:
-            eligible_loans.append(loan_detail)
-        else:
-            ineligible_loans.append(loan_detail)
+    eligible_loans = [d for d in details if d["eligible"]]
+    ineligible_loans = [d for d in details if not d["eligible"]]
 
     # Sort eligible loans by amount (descending)
-    eligible_loans.sort(key=lambda x: x["max_loan_amount"], reverse=True)
+    eligible_loans.sort(key=itemgetter("max_loan_amount"), reverse=True)
 
     # Credit improvement path
     improvement = _get_credit_improvement_path(score, tier, repayment)
@@ -1058,7 +1512,7 @@ def get_persona_loan_recommendations(
         "score": score,
         "persona": persona,
         "tier": tier,
-        "repayment_capacity": repayment,
+        "repayment_capacity": repayment.as_dict(),
         "eligible_loans": eligible_loans,
         "ineligible_loans": ineligible_loans,
         "max_simultaneous_loans": tier["max_simultaneous_loans"],
@@ -1101,8 +1555,22 @@ def _estimate_income_from_persona(persona: str, data: Dict) -> float:
     return 10000  # default fallback
 
 
+# Profile values that count as "not provided" for an eligibility criterion
+_FALSY_SENTINELS = frozenset((False, 0, "", "0", "none"))
+
+
+def _criterion_met(val: Any) -> bool:
+    """True if a persona profile value satisfies an eligibility criterion."""
+    if not val:
+        return False
+    try:
+        return val not in _FALSY_SENTINELS
+    except TypeError:  # unhashable (list/dict) values are never sentinels
+        return True
+
+
 def _check_persona_loan_eligibility(
-    loan: Dict, score: float, data: Dict, tier: Dict
+    loan: LoanProduct, score: float, data: Dict, tier: Dict
 ) -> Dict:
     """Check eligibility for persona-specific loan."""
     reasons = []
@@ -1110,18 +1578,18 @@ def _check_persona_loan_eligibility(
     criteria_met = []
     criteria_not_met = []
 
-    if score < loan["min_score"]:
+    if score < loan.min_score:
         eligible = False
-        reasons.append(f"Score {score:.0f} below minimum {loan['min_score']}")
+        reasons.append(f"Score {score:.0f} below minimum {loan.min_score}")
 
     if tier["max_simultaneous_loans"] == 0:
         eligible = False
         reasons.append("Score too low for any loans")
 
     # Check persona-specific eligibility criteria
-    for criterion in loan.get("eligibility_criteria", []):
+    for criterion in loan.eligibility_criteria:
         val = data.get(criterion)
-        if val and val not in (False, 0, "", "0", "none"):
+        if _criterion_met(val):
             criteria_met.append(criterion)
         else:
             criteria_not_met.append(criterion)
@@ -1141,22 +1609,18 @@ def _check_persona_loan_eligibility(
 
 
 def _build_persona_loan_detail(
-    loan_key: str, loan: Dict, score: float, income: float,
-    tier: Dict, repayment: Dict, eligibility: Dict
+    loan: LoanProduct, rate_band: int, income: float,
+    tier: Dict, repayment: RepaymentCapacity, eligibility: Dict
 ) -> Dict:
     """Build loan detail for persona-specific products."""
-    # Interest rate: use loan's own range (often subsidized)
-    loan_rate_low, loan_rate_high = loan["interest_range"]
-    if score >= 700:
-        effective_rate = loan_rate_low
-    elif score >= 550:
-        effective_rate = loan_rate_low + (loan_rate_high - loan_rate_low) * 0.4
-    else:
-        effective_rate = loan_rate_high
+    # Interest rate: use loan's own range (often subsidized), priced by
+    # rate_band from _PERSONA_RATE_CUTOFFS
+    effective_rate = loan.band_rates[rate_band]
 
     # Max amount: capped by product limits (not FOIR for govt schemes)
-    max_amount = loan["amount_range"][1]
-    min_amount = loan["amount_range"][0]
+    min_amount, product_max = loan.amount_range
+    tenure_low, tenure_high = loan.tenure_range
+    max_amount = product_max
 
     # If income is known, also apply a reasonable income multiplier
     if income > 0:
@@ -1165,61 +1629,107 @@ def _build_persona_loan_detail(
             max_amount = income_cap
 
     # Recommended: 60% of max for alternative profiles (conservative)
-    recommended = min(max_amount * 0.6, loan["amount_range"][1])
+    recommended = min(max_amount * 0.6, product_max)
     recommended = max(recommended, min_amount)
 
     # Tenure
-    suggested_tenure = loan["tenure_range"][1]
-    if tier["max_tenure_months"] > 0:
-        suggested_tenure = min(suggested_tenure, tier["max_tenure_months"])
+    suggested_tenure = tenure_high
+    max_tenure = tier["max_tenure_months"]
+    if max_tenure > 0:
+        suggested_tenure = min(suggested_tenure, max_tenure)
     if suggested_tenure == 0:
-        suggested_tenure = loan["tenure_range"][0]
+        suggested_tenure = tenure_low
 
     emi = calculate_emi(recommended, effective_rate, suggested_tenure)
-    total_interest = calculate_total_interest(
-        recommended, effective_rate, suggested_tenure
-    )
+    total_interest = calculate_total_interest(recommended, effective_rate, suggested_tenure)
 
-    # Interest saved if subsidy exists
+    # Subsidy savings estimate
     interest_saved = 0
-    if loan.get("subsidy"):
-        market_rate = effective_rate + 5  # assume 5% higher without subsidy
+    if loan.subsidy:
+        # Assume 5% higher rate without subsidy
         market_interest = calculate_total_interest(
-            recommended, market_rate, suggested_tenure
+            recommended, effective_rate + 5, suggested_tenure
         )
         interest_saved = max(market_interest - total_interest, 0)
 
     return {
-        "key": loan_key,
-        "name": loan["name"],
-        "icon": loan["icon"],
-        "category": loan["category"],
+        "key": loan.key,
+        "name": loan.name,
+        "icon": loan.icon,
+        "category": loan.category,
         "eligible": eligibility["eligible"],
         "reasons": eligibility.get("reasons", []),
         "criteria_met": eligibility.get("criteria_met", []),
         "criteria_not_met": eligibility.get("criteria_not_met", []),
-        "effective_rate": round(effective_rate, 2),
+        "effective_rate": loan.band_rates_2dp[rate_band],
         "max_loan_amount": round(max_amount, 0),
         "recommended_amount": round(recommended, 0),
         "min_amount": min_amount,
         "emi": emi,
         "suggested_tenure": suggested_tenure,
-        "tenure_range": loan["tenure_range"],
+        "tenure_range": loan.tenure_range,
         "total_interest": total_interest,
         "interest_saved_via_subsidy": round(interest_saved, 0),
-        "collateral_required": loan.get("collateral", False),
-        "processing_fee": loan["processing_fee"],
-        "description": loan["description"],
-        "lenders": loan["lenders"],
-        "documents": loan["documents"],
-        "subsidy": loan.get("subsidy"),
+        "collateral_required": loan.collateral,
+        "processing_fee": loan.processing_fee,
+        "description": loan.description,
+        "lenders": loan.lenders,
+        "documents": loan.documents,
+        "subsidy": loan.subsidy,
     }
 
 
 # ─── Credit Improvement Path ────────────────────────────────────────────────
 
+# Current tier → (next tier, score needed, what it unlocks)
+_TIER_UPGRADES = {
+    "very_poor": ("poor", 400, "Micro Loans"),
+    "poor": ("fair", 500, "Standard Micro Loans"),
+    "fair": ("good", 650, "Personal & Business Loans"),
+    "good": ("excellent", 750, "Premium Loans & Credit Cards"),
+}
+
+_FINANCIAL_HEALTH_ACTIONS = (
+    "Reduce existing EMI burden by prepaying high-interest loans",
+    "Increase income through supplementary earnings",
+    "Reduce fixed expenses to improve disposable income",
+)
+
+_MAINTENANCE_ACTIONS = (
+    "Continue on-time payments across all obligations",
+    "Keep FOIR below 40% for best rates",
+    "Diversify income sources for higher limits",
+    "Build 6+ months emergency fund",
+)
+
+# Score improvement actions for scores below each band's upper bound;
+# scores of 750 and above get none
+_SCORE_BANDS = (450, 600, 750)
+_BAND_ACTIONS = (
+    (
+        "Start regular mobile recharges (monthly plans)",
+        "Pay utility bills on time for 3+ months",
+        "Get Aadhaar and at least one more government ID",
+        "Join a Self-Help Group (SHG) or community group",
+    ),
+    (
+        "Maintain 6+ months of consistent income records",
+        "Build a savings habit — even ₹500/month helps",
+        "Pay all utility bills within due date",
+        "Get references from community members or employers",
+    ),
+    (
+        "Maintain transaction consistency (avoid long gaps)",
+        "Reduce expense-to-income ratio below 60%",
+        "Build recurring savings (SIP, RD, or SHG deposits)",
+        "Establish 12+ month positive payment history",
+    ),
+    (),
+)
+
+
 def _get_credit_improvement_path(
-    score: float, tier: Dict, repayment: Dict
+    score: float, tier: Dict, repayment: RepaymentCapacity
 ) -> List[Dict]:
     """
     Generate actionable steps to improve score → unlock better loans.
@@ -1227,16 +1737,9 @@ def _get_credit_improvement_path(
     improvements = []
     current_tier_key = tier["tier_key"]
 
-    # Map current tier to next tier unlock
-    tier_upgrades = {
-        "very_poor": ("poor", 400, "Micro Loans"),
-        "poor": ("fair", 500, "Standard Micro Loans"),
-        "fair": ("good", 650, "Personal & Business Loans"),
-        "good": ("excellent", 750, "Premium Loans & Credit Cards"),
-    }
-
-    if current_tier_key in tier_upgrades:
-        next_key, target_score, unlocks = tier_upgrades[current_tier_key]
+    upgrade = _TIER_UPGRADES.get(current_tier_key)
+    if upgrade is not None:
+        next_key, target_score, unlocks = upgrade
         gap = target_score - score
         next_tier = SCORE_TIERS[next_key]
 
@@ -1258,29 +1761,19 @@ def _get_credit_improvement_path(
         })
 
     # Repayment capacity improvements
-    if repayment.get("risk_flags"):
-        for flag in repayment["risk_flags"]:
-            improvements.append({
-                "type": "financial_health",
-                "title": flag,
-                "actions": [
-                    "Reduce existing EMI burden by prepaying high-interest loans",
-                    "Increase income through supplementary earnings",
-                    "Reduce fixed expenses to improve disposable income",
-                ],
-            })
+    for flag in repayment.risk_flags:
+        improvements.append({
+            "type": "financial_health",
+            "title": flag,
+            "actions": list(_FINANCIAL_HEALTH_ACTIONS),
+        })
 
     # If score is already excellent, show maintenance tips
     if current_tier_key == "excellent":
         improvements.append({
             "type": "maintenance",
             "title": "Maintain your excellent score",
-            "actions": [
-                "Continue on-time payments across all obligations",
-                "Keep FOIR below 40% for best rates",
-                "Diversify income sources for higher limits",
-                "Build 6+ months emergency fund",
-            ],
+            "actions": list(_MAINTENANCE_ACTIONS),
         })
 
     return improvements
@@ -1288,29 +1781,7 @@ def _get_credit_improvement_path(
 
 def _get_score_improvement_actions(score: float, gap: float) -> List[str]:
     """Contextual actions based on current score gap."""
-    actions = []
-
-    if score < 450:
-        actions.extend([
-            "Start regular mobile recharges (monthly plans)",
-            "Pay utility bills on time for 3+ months",
-            "Get Aadhaar and at least one more government ID",
-            "Join a Self-Help Group (SHG) or community group",
-        ])
-    elif score < 600:
-        actions.extend([
-            "Maintain 6+ months of consistent income records",
-            "Build a savings habit — even ₹500/month helps",
-            "Pay all utility bills within due date",
-            "Get references from community members or employers",
-        ])
-    elif score < 750:
-        actions.extend([
-            "Maintain transaction consistency (avoid long gaps)",
-            "Reduce expense-to-income ratio below 60%",
-            "Build recurring savings (SIP, RD, or SHG deposits)",
-            "Establish 12+ month positive payment history",
-        ])
+    actions = list(_BAND_ACTIONS[bisect.bisect_right(_SCORE_BANDS, score)])
 
     if gap <= 30:
         actions.insert(0, f"You're only {gap:.0f} points away — focus on consistency!")
@@ -1320,6 +1791,21 @@ def _get_score_improvement_actions(score: float, gap: float) -> List[str]:
 
 # ─── Repayment Schedule Generator ───────────────────────────────────────────
 
+_MONTH_NAMES = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"
+)
+
+
+@lru_cache(maxsize=256)
+def _month_labels(start_month_idx: int, start_year: int, count: int) -> Tuple[str, ...]:
+    """"Mon YYYY" labels for `count` consecutive months; shared across schedules."""
+    return tuple(
+        f"{_MONTH_NAMES[k % 12]} {start_year + k // 12}"
+        for k in range(start_month_idx, start_month_idx + count)
+    )
+
+
 def generate_repayment_schedule(
     principal: float, annual_rate: float,
     tenure_months: int, start_month: str = "Jan 2026"
@@ -1332,40 +1818,33 @@ def generate_repayment_schedule(
 
     emi = calculate_emi(principal, annual_rate, tenure_months)
     r = annual_rate / (12 * 100) if annual_rate > 0 else 0
-    balance = principal
-    schedule = []
-
-    months = [
-        "Jan", "Feb", "Mar", "Apr", "May", "Jun",
-        "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"
-    ]
 
     # Parse start month
     try:
         parts = start_month.split()
-        start_month_idx = months.index(parts[0])
+        start_month_idx = _MONTH_NAMES.index(parts[0])
         start_year = int(parts[1])
     except (ValueError, IndexError):
         start_month_idx = 0
         start_year = 2026
 
-    for i in range(tenure_months):
-        interest_component = balance * r
-        principal_component = emi - interest_component
-        balance = max(balance - principal_component, 0)
-
-        month_idx = (start_month_idx + i) % 12
-        year = start_year + (start_month_idx + i) // 12
-
-        schedule.append({
-            "month": f"{months[month_idx]} {year}",
-            "emi": round(emi, 2),
-            "principal": round(principal_component, 2),
-            "interest": round(interest_component, 2),
-            "balance": round(balance, 2),
-        })
-
-    return schedule
+    principal_part, interest, balance = _amortize(
+        float(principal), float(r), float(emi), int(tenure_months)
+    )
+    labels = _month_labels(start_month_idx, start_year, tenure_months)
+    emi_rounded = round(emi, 2)
+
+    return [
+        {
+            "month": label,
+            "emi": emi_rounded,
+            "principal": round(p, 2),
+            "interest": round(i, 2),
+            "balance": round(b, 2),
+        }
+        for label, p, i, b in zip(labels, principal_part.tolist(),
+                                  interest.tolist(), balance.tolist())
+    ]
 
 
 # ─── Loan Comparison ────────────────────────────────────────────────────────
@@ -1396,118 +1875,118 @@ def compare_loans(loans: List[Dict]) -> List[Dict]:
             collateral_score * 0.15
         )
 
-        scored.append({**loan, "_composite_score": composite})
+        scored.append((composite, loan))
 
-    scored.sort(key=lambda x: x["_composite_score"], reverse=True)
-    return scored[:3]
+    # Only the top 3 are returned, so only they get a copied dict
+    top = heapq.nlargest(3, scored, key=itemgetter(0))
+    return [{**loan, "_composite_score": composite} for composite, loan in top]
 
 
 # ─── Financial Literacy Tips ────────────────────────────────────────────────
 
+# Tip cards, built once; get_financial_tips returns copies
+_EMI_TIP = {
+    "icon": "💡",
+    "title": "Understand EMI Before You Borrow",
+    "detail": "Your EMI should never exceed 40% of your monthly income. "
+              "Use our EMI calculator to plan."
+}
+
+_CREDIT_HISTORY_TIP = {
+    "icon": "📈",
+    "title": "Build Credit History First",
+    "detail": "Start with small loans (₹5K-₹10K), repay on time, "
+              "and your score will improve within 6 months."
+}
+
+_PERSONA_TIPS = {
+    "farmer": (
+        {
+            "icon": "🌾",
+            "title": "KCC Has 4% Interest Subvention",
+            "detail": "Kisan Credit Card loans have only 4% effective "
+                      "interest if repaid within 1 year. Much cheaper than "
+                      "informal moneylenders (36-60%)."
+        },
+        {
+            "icon": "☀️",
+            "title": "PM-KUSUM: 60% Subsidy on Solar Pumps",
+            "detail": "Govt covers 60% of solar pump cost. You only pay 40%. "
+                      "Saves ₹3,000-₹5,000/month on electricity."
+        },
+    ),
+    "student": (
+        {
+            "icon": "🎓",
+            "title": "Education Loan Interest Subsidy",
+            "detail": "Family income < ₹4.5L/yr? You get full interest waiver "
+                      "during study + 1 year moratorium under CSIS scheme."
+        },
+        {
+            "icon": "📚",
+            "title": "Vidya Lakshmi Portal",
+            "detail": "Apply to multiple bank education loans with single form at "
+                      "vidyalakshmi.co.in. Compare rates across 38 banks."
+        },
+    ),
+    "street_vendor": (
+        {
+            "icon": "🏪",
+            "title": "PM SVANidhi: ₹1,200 Digital Cashback",
+            "detail": "Accept 50+ digital payments/month and earn ₹1,200/year "
+                      "cashback. Plus 7% interest subsidy on your loan."
+        },
+        {
+            "icon": "📈",
+            "title": "SVANidhi 3-Tranche Growth",
+            "detail": "Repay ₹10K → Get ₹20K → Repay → Get ₹50K. "
+                      "Each stage unlocks a larger loan with better terms."
+        },
+    ),
+    "homemaker": (
+        {
+            "icon": "👩‍👩‍👧‍👦",
+            "title": "Women SHG Loans at 4% Interest",
+            "detail": "Self-Help Group members get 3% interest subvention. "
+                      "Effective rate is only 4% — much lower than market."
+        },
+        {
+            "icon": "🏗️",
+            "title": "Stand-Up India: ₹10L-₹1Cr for Women",
+            "detail": "Every bank branch must give at least 1 loan of ₹10L-₹1Cr "
+                      "to a woman entrepreneur. Ask your nearest bank."
+        },
+    ),
+    "general_no_bank": (
+        {
+            "icon": "🤝",
+            "title": "JLG: No Collateral, Group Guarantee",
+            "detail": "Join a group of 5-10 people. The group's joint guarantee "
+                      "replaces collateral. Available at MFIs and NABARD."
+        },
+        {
+            "icon": "🪙",
+            "title": "Gold Loan: Fastest Approval",
+            "detail": "Gold loans need zero income proof and disburse in 30 minutes. "
+                      "Interest is only 7-12% vs 36%+ from moneylenders."
+        },
+    ),
+}
+
+
 def get_financial_tips(persona: str = None, score: float = 0,
                        eligible_loans: List[Dict] = None) -> List[Dict]:
     """
     Return contextual financial literacy tips based on persona and situation.
     """
-    tips = []
-
     # General tips
-    tips.append({
-        "icon": "💡",
-        "title": "Understand EMI Before You Borrow",
-        "detail": "Your EMI should never exceed 40% of your monthly income. "
-                  "Use our EMI calculator to plan."
-    })
+    tips = [dict(_EMI_TIP)]
 
     if score < 600:
-        tips.append({
-            "icon": "📈",
-            "title": "Build Credit History First",
-            "detail": "Start with small loans (₹5K-₹10K), repay on time, "
-                      "and your score will improve within 6 months."
-        })
+        tips.append(dict(_CREDIT_HISTORY_TIP))
 
     # Persona-specific tips
-    if persona == "farmer":
-        tips.extend([
-            {
-                "icon": "🌾",
-                "title": "KCC Has 4% Interest Subvention",
-                "detail": "Kisan Credit Card loans have only 4% effective "
-                          "interest if repaid within 1 year. Much cheaper than "
-                          "informal moneylenders (36-60%)."
-            },
-            {
-                "icon": "☀️",
-                "title": "PM-KUSUM: 60% Subsidy on Solar Pumps",
-                "detail": "Govt covers 60% of solar pump cost. You only pay 40%. "
-                          "Saves ₹3,000-₹5,000/month on electricity."
-            },
-        ])
-
-    elif persona == "student":
-        tips.extend([
-            {
-                "icon": "🎓",
-                "title": "Education Loan Interest Subsidy",
-                "detail": "Family income < ₹4.5L/yr? You get full interest waiver "
-                          "during study + 1 year moratorium under CSIS scheme."
-            },
-            {
-                "icon": "📚",
-                "title": "Vidya Lakshmi Portal",
-                "detail": "Apply to multiple bank education loans with single form at "
-                          "vidyalakshmi.co.in. Compare rates across 38 banks."
-            },
-        ])
-
-    elif persona == "street_vendor":
-        tips.extend([
-            {
-                "icon": "🏪",
-                "title": "PM SVANidhi: ₹1,200 Digital Cashback",
-                "detail": "Accept 50+ digital payments/month and earn ₹1,200/year "
-                          "cashback. Plus 7% interest subsidy on your loan."
-            },
-            {
-                "icon": "📈",
-                "title": "SVANidhi 3-Tranche Growth",
-                "detail": "Repay ₹10K → Get ₹20K → Repay → Get ₹50K. "
-                          "Each stage unlocks a larger loan with better terms."
-            },
-        ])
-
-    elif persona == "homemaker":
-        tips.extend([
-            {
-                "icon": "👩‍👩‍👧‍👦",
-                "title": "Women SHG Loans at 4% Interest",
-                "detail": "Self-Help Group members get 3% interest subvention. "
-                          "Effective rate is only 4% — much lower than market."
-            },
-            {
-                "icon": "🏗️",
-                "title": "Stand-Up India: ₹10L-₹1Cr for Women",
-                "detail": "Every bank branch must give at least 1 loan of ₹10L-₹1Cr "
-                          "to a woman entrepreneur. Ask your nearest bank."
-            },
-        ])
-
-    elif persona == "general_no_bank":
-        tips.extend([
-            {
-                "icon": "🤝",
-                "title": "JLG: No Collateral, Group Guarantee",
-                "detail": "Join a group of 5-10 people. The group's joint guarantee "
-                          "replaces collateral. Available at MFIs and NABARD."
-            },
-            {
-                "icon": "🪙",
-                "title": "Gold Loan: Fastest Approval",
-                "detail": "Gold loans need zero income proof and disburse in 30 minutes. "
-                          "Interest is only 7-12% vs 36%+ from moneylenders."
-            },
-        ])
+    tips.extend(dict(tip) for tip in _PERSONA_TIPS.get(persona, ()))
 
     # Loan-specific tips
     if eligible_loans:
@@ -1550,36 +2029,95 @@ CROP_SEASONS = {
     },
 }
 
+# Month → (season, info, active) for each season that is active or taking
+# applications that month, in CROP_SEASONS order
+_SEASONS_BY_MONTH = {
+    month: tuple(
+        (season, info, month in info["months"])
+        for season, info in CROP_SEASONS.items()
+        if month in info["months"] or month == info["apply_by"]
+    )
+    for month in _MONTH_NAMES
+}
+_MONTH_INDEX = {month: i for i, month in enumerate(_MONTH_NAMES)}
+
+
+def _catalog_entry(row: int) -> Dict:
+    """Catalog dict (product fields + source/persona tags) for one table row."""
+    source, persona, key, loan = _LOAN_ROWS[row]
+    return {
+        **loan,
+        "key": key,
+        "source": source,
+        "persona": persona,
+        "eligibility_criteria": (loan.get("eligibility_criteria", [])
+                                 if source == "persona" else []),
+    }
+
+
+# Flattened catalog, one tagged dict per _LOAN_ROWS row, built once; callers
+# get copies so the shared entries are never mutated
+_CATALOG_ENTRIES = tuple(_catalog_entry(row) for row in range(len(_LOAN_ROWS)))
+
+# Sorted unique non-empty categories across the catalog (get_loan_categories)
+_LOAN_CATEGORIES = tuple(sorted(
+    {entry["category"] for entry in _CATALOG_ENTRIES if entry.get("category")}
+))
+
+# Per-row lowercased free-text haystack for search_loans (name, category,
+# description, lenders, key, persona, subsidy)
+_CATALOG_SEARCH_TEXT = tuple(
+    " ".join([
+        loan.get("name", ""),
+        loan.get("category", ""),
+        loan.get("description", ""),
+        " ".join(loan.get("lenders", [])),
+        loan.get("key", ""),
+        loan.get("persona", "") or "",
+        loan.get("subsidy", "") or "",
+    ]).lower()
+    for loan in _CATALOG_ENTRIES
+)
+
+
+def _rows_by_value(values) -> Dict[Any, np.ndarray]:
+    """Row mask for each distinct value of a catalog column."""
+    column = np.array(values, dtype=object)
+    return {value: column == value for value in dict.fromkeys(column.tolist())}
+
+
+# Exact-match filter value → row mask (category lowercased), so search_loans
+# ANDs prebuilt masks instead of comparing strings across the catalog
+_SOURCE_ROWS = _rows_by_value(_LOAN_TABLE["source"])
+_PERSONA_ROWS = _rows_by_value(_LOAN_TABLE["persona"])
+_CATEGORY_ROWS = _rows_by_value(
+    [loan.get("category", "").lower() for loan in _CATALOG_ENTRIES]
+)
+_NO_ROWS = np.zeros(len(_LOAN_ROWS), dtype=np.bool_)
+
+# Inverted index over the haystacks: token → row mask
+_SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _build_search_postings() -> Dict[str, np.ndarray]:
+    postings: Dict[str, np.ndarray] = {}
+    for row, text in enumerate(_CATALOG_SEARCH_TEXT):
+        for token in set(_SEARCH_TOKEN_RE.findall(text)):
+            if token not in postings:
+                postings[token] = np.zeros(len(_CATALOG_SEARCH_TEXT), dtype=np.bool_)
+            postings[token][row] = True
+    return postings
+
+
+_SEARCH_POSTINGS = _build_search_postings()
+
 
 def get_all_loans_catalog() -> List[Dict]:
     """
     Return a flat list of ALL loans (transaction + all persona catalogs)
     with source/persona tags for browsing/searching.
     """
-    catalog = []
-
-    # Transaction-based loans
-    for key, loan in TRANSACTION_LOANS.items():
-        catalog.append({
-            **loan,
-            "key": key,
-            "source": "transaction",
-            "persona": None,
-            "eligibility_criteria": [],
-        })
-
-    # Persona-based loans
-    for persona_key, persona_loans in PERSONA_LOANS.items():
-        for key, loan in persona_loans.items():
-            catalog.append({
-                **loan,
-                "key": key,
-                "source": "persona",
-                "persona": persona_key,
-                "eligibility_criteria": loan.get("eligibility_criteria", []),
-            })
-
-    return catalog
+    return [entry.copy() for entry in _CATALOG_ENTRIES]
 
 
 def search_loans(
@@ -1608,65 +2146,74 @@ def search_loans(
     Returns:
         Filtered list of loan dicts with source/persona tags
     """
-    catalog = get_all_loans_catalog()
-    results = []
-
+    # Numeric, tag and category filters as one mask over the columnar catalog
+    mask = np.ones(len(_LOAN_ROWS), dtype=np.bool_)
+    if source_filter:
+        mask &= _SOURCE_ROWS.get(source_filter, _NO_ROWS)
+    if persona_filter:
+        mask &= _PERSONA_ROWS.get(persona_filter, _NO_ROWS)
+    if collateral_filter == "no":
+        mask &= ~_LOAN_TABLE["collateral"]
+    elif collateral_filter == "yes":
+        mask &= _LOAN_TABLE["collateral"]
+    if subsidy_filter:
+        mask &= _LOAN_TABLE["has_subsidy"]
+    if max_rate > 0:
+        mask &= _LOAN_TABLE["rate_lo"] <= max_rate
+    if min_amount > 0:
+        mask &= _LOAN_TABLE["amt_hi"] >= min_amount
+    if category:
+        mask &= _CATEGORY_ROWS.get(category.lower(), _NO_ROWS)
+
+    # Free-text search over the precomputed lowercase haystacks. A token
+    # with a separator on both sides in the query must appear as a whole
+    # token in any matching haystack, so its posting narrows the rows
+    # before the substring check; the first/last tokens may be partial
+    # words and are left to that check.
     query_lower = query.strip().lower()
+    for match in _SEARCH_TOKEN_RE.finditer(query_lower):
+        if match.start() > 0 and match.end() < len(query_lower):
+            posting = _SEARCH_POSTINGS.get(match.group())
+            if posting is None:
+                return []
+            mask &= posting
+    return [
+        _CATALOG_ENTRIES[row].copy()
+        for row in np.flatnonzero(mask).tolist()
+        if not query_lower or query_lower in _CATALOG_SEARCH_TEXT[row]
+    ]
 
-    for loan in catalog:
-        # --- Text search ---
-        if query_lower:
-            searchable = " ".join([
-                loan.get("name", ""),
-                loan.get("category", ""),
-                loan.get("description", ""),
-                " ".join(loan.get("lenders", [])),
-                loan.get("key", ""),
-                loan.get("persona", "") or "",
-                loan.get("subsidy", "") or "",
-            ]).lower()
-            if query_lower not in searchable:
-                continue
-
-        # --- Category filter ---
-        if category and loan.get("category", "").lower() != category.lower():
-            continue
-
-        # --- Source filter ---
-        if source_filter:
-            if loan.get("source", "") != source_filter:
-                continue
-
-        # --- Persona filter ---
-        if persona_filter:
-            if loan.get("persona", "") != persona_filter:
-                continue
-
-        # --- Collateral filter ---
-        if collateral_filter == "no" and loan.get("collateral", False):
-            continue
-        if collateral_filter == "yes" and not loan.get("collateral", False):
-            continue
-
-        # --- Subsidy filter ---
-        if subsidy_filter and not loan.get("subsidy"):
-            continue
-
-        # --- Max interest rate filter ---
-        if max_rate > 0:
-            loan_min_rate = loan.get("interest_range", (0, 0))[0]
-            if loan_min_rate > max_rate:
-                continue
-
-        # --- Min amount filter ---
-        if min_amount > 0:
-            loan_max_amount = loan.get("amount_range", (0, 0))[1]
-            if loan_max_amount < min_amount:
-                continue
-
-        results.append(loan)
 
-    return results
+# Eligibility gap check → steps to close it, given (gap, loan_details)
+_IMPROVEMENT_STEPS = {
+    "Credit Score": lambda gap, loan_details: [
+        f"Improve score by {gap['gap']} — pay bills on time, maintain consistent income records",
+        "Use Score Builder page to see exactly which criteria to improve",
+    ],
+    "Monthly Income": lambda gap, loan_details: [
+        f"Increase income by {gap['gap']} — consider supplementary income sources",
+        "After income improves, upload 6-month bank statement to verify",
+    ],
+    "Loan Tier Access": lambda gap, loan_details: [
+        "Focus on consistently paying utility bills on time",
+        "Get registered with Aadhaar + PAN for identity verification",
+        "Join an SHG or JLG group for initial credit access",
+    ],
+    "Repayment Capacity": lambda gap, loan_details: [
+        "Pay off or reduce existing loan EMIs first",
+        "Reduce monthly fixed expenses",
+        "Consider increasing income before applying",
+    ],
+    "Loan Amount": lambda gap, loan_details: [
+        f"Apply for a lower amount (max eligible: {loan_details.get('max_eligible_amount', 'N/A')})",
+        "Improve score / income to increase eligibility limit",
+    ],
+    "EMI Affordability": lambda gap, loan_details: [
+        "Choose a longer tenure to reduce monthly EMI",
+        "Apply for a smaller amount to bring EMI within budget",
+        "Pay off existing EMIs to free up capacity",
+    ],
+}
 
 
 def check_loan_eligibility(
@@ -1722,14 +2269,78 @@ def check_loan_eligibility(
     if monthly_income <= 0 and source == "persona" and persona:
         monthly_income = _estimate_income_from_persona(persona, persona_data)
 
-    repayment = analyze_repayment_capacity(
+    repayment = repayment_capacity(
+        monthly_income, monthly_expenses, existing_emi, foir_cap
+    )
+    return _assess_loan(
+        loan_key, loan, source, persona, score, monthly_income, tier,
+        repayment, persona_data, desired_amount, desired_tenure,
+    )
+
+
+def check_all_eligibility(
+    score: float = 0,
+    monthly_income: float = 0,
+    monthly_expenses: float = 0,
+    existing_emi: float = 0,
+    persona: str = "",
+    persona_data: Optional[Dict] = None,
+    desired_amount: float = 0,
+    desired_tenure: int = 0,
+) -> List[Dict]:
+    """
+    check_loan_eligibility for every transaction loan and, when `persona`
+    is given, every loan in that persona's catalog, in catalog order.
+
+    The score tier, persona income estimate and repayment capacity are
+    worked out once per applicant rather than once per loan. Each result
+    is the same dict check_loan_eligibility returns, plus "loan_key".
+    """
+    persona_data = persona_data or {}
+    tier = get_score_tier(score)
+    foir_cap = tier["foir_cap"]
+
+    repayment = repayment_capacity(
         monthly_income, monthly_expenses, existing_emi, foir_cap
     )
+    catalogs = [("transaction", TRANSACTION_LOANS, monthly_income, repayment)]
+    if persona:
+        persona_income = monthly_income
+        persona_repayment = repayment
+        if monthly_income <= 0:
+            persona_income = _estimate_income_from_persona(persona, persona_data)
+            persona_repayment = repayment_capacity(
+                persona_income, monthly_expenses, existing_emi, foir_cap
+            )
+        catalogs.append((
+            "persona", PERSONA_LOANS.get(persona, {}), persona_income, persona_repayment,
+        ))
 
+    results = []
+    for source, loans, income, capacity in catalogs:
+        for loan_key, loan in loans.items():
+            result = _assess_loan(
+                loan_key, loan, source, persona, score, income, tier,
+                capacity, persona_data, desired_amount, desired_tenure,
+            )
+            result["loan_key"] = loan_key
+            results.append(result)
+    return results
+
+
+def _assess_loan(loan_key: str, loan: Dict, source: str, persona: str,
+                 score: float, monthly_income: float, tier: Dict,
+                 repayment: RepaymentCapacity, persona_data: Dict,
+                 desired_amount: float, desired_tenure: int) -> Dict:
+    """
+    Eligibility verdict for one resolved catalog loan, given the
+    applicant's score tier and repayment capacity (check_loan_eligibility).
+    """
     # --- Run all eligibility checks ---
     reasons_pass = []
     reasons_fail = []
     gap_analysis = []
+    has_score_fail = has_income_fail = has_tier_fail = False
 
     # 1. Score check
     min_score = loan.get("min_score", 0)
@@ -1739,6 +2350,7 @@ def check_loan_eligibility(
         )
     else:
         gap = min_score - score
+        has_score_fail = True
         reasons_fail.append(
             f"Score {score:.0f} is below minimum {min_score} (need +{gap:.0f} points)"
         )
@@ -1759,6 +2371,7 @@ def check_loan_eligibility(
             )
         else:
             gap_income = min_income - monthly_income
+            has_income_fail = True
             reasons_fail.append(
                 f"Monthly income Rs.{monthly_income:,.0f} below minimum Rs.{min_income:,} "
                 f"(need +Rs.{gap_income:,.0f})"
@@ -1777,6 +2390,7 @@ def check_loan_eligibility(
             f"Score tier '{tier['grade']}' allows up to {tier['max_simultaneous_loans']} loan(s)"
         )
     else:
+        has_tier_fail = True
         reasons_fail.append(
             "Score tier 'Very Poor' does not allow any loans. Improve score to 400+ first."
         )
@@ -1789,31 +2403,31 @@ def check_loan_eligibility(
         })
 
     # 4. Repayment capacity check
-    if repayment["verdict"] == "NOT_ELIGIBLE":
+    if repayment.verdict == "NOT_ELIGIBLE":
         reasons_fail.append(
             "Repayment capacity insufficient — income is zero or FOIR exceeded"
         )
         gap_analysis.append({
             "check": "Repayment Capacity",
-            "current": f"Max new EMI: Rs.{repayment['max_new_emi']:,.0f}",
+            "current": f"Max new EMI: Rs.{repayment.max_new_emi:,.0f}",
             "required": "Positive EMI capacity",
             "gap": "Reduce existing EMIs or increase income",
             "difficulty": "Hard",
         })
-    elif repayment["verdict"] == "MICRO_ONLY":
+    elif repayment.verdict == "MICRO_ONLY":
         reasons_pass.append(
-            f"Limited repayment capacity: max new EMI Rs.{repayment['max_new_emi']:,.0f}"
+            f"Limited repayment capacity: max new EMI Rs.{repayment.max_new_emi:,.0f}"
         )
     else:
         reasons_pass.append(
-            f"Repayment capacity healthy: max new EMI Rs.{repayment['max_new_emi']:,.0f}"
+            f"Repayment capacity healthy: max new EMI Rs.{repayment.max_new_emi:,.0f}"
         )
 
     # 5. Persona-specific eligibility criteria
     for criterion in loan.get("eligibility_criteria", []):
         val = persona_data.get(criterion)
         label = criterion.replace("_", " ").title()
-        if val and val not in (False, 0, "", "0", "none"):
+        if _criterion_met(val):
             reasons_pass.append(f"Criteria '{label}' is met")
         else:
             reasons_fail.append(
@@ -1822,21 +2436,12 @@ def check_loan_eligibility(
 
     # --- Determine overall eligibility ---
     eligible = len(reasons_fail) == 0
-    has_score_fail = any("Score" in r and "below" in r for r in reasons_fail)
-    has_income_fail = any("income" in r.lower() and "below" in r.lower() for r in reasons_fail)
-    has_tier_fail = any("Loan Tier" in r or "Very Poor" in r for r in reasons_fail)
 
-    if has_tier_fail:
+    if has_tier_fail or has_score_fail or has_income_fail or repayment.verdict == "NOT_ELIGIBLE":
         verdict = "NOT_ELIGIBLE"
-    elif has_score_fail and has_income_fail:
-        verdict = "NOT_ELIGIBLE"
-    elif has_score_fail or has_income_fail:
-        verdict = "NOT_ELIGIBLE"
-    elif repayment["verdict"] == "NOT_ELIGIBLE":
-        verdict = "NOT_ELIGIBLE"
-    elif repayment["verdict"] == "MICRO_ONLY":
+    elif repayment.verdict == "MICRO_ONLY":
         verdict = "MICRO_ONLY"
-    elif len(reasons_fail) > 0:
+    elif reasons_fail:
         verdict = "ELIGIBLE_WITH_CAUTION"
     else:
         verdict = "ELIGIBLE"
@@ -1845,25 +2450,20 @@ def check_loan_eligibility(
     loan_details = {}
     if verdict in ("ELIGIBLE", "ELIGIBLE_WITH_CAUTION", "MICRO_ONLY"):
         # Effective interest rate based on score
-        rate_low, rate_high = loan["interest_range"]
-        if score >= 750:
-            effective_rate = rate_low
-        elif score >= 650:
-            effective_rate = rate_low + (rate_high - rate_low) * 0.3
-        elif score >= 500:
-            effective_rate = rate_low + (rate_high - rate_low) * 0.6
-        else:
-            effective_rate = rate_high
+        effective_rate = _band_rate(
+            loan["interest_range"],
+            _TRANSACTION_RATE_BLENDS[_rate_band(score, _TRANSACTION_RATE_CUTOFFS)],
+        )
 
         # Max loan amount
         max_by_product = loan["amount_range"][1]
         max_by_income = monthly_income * tier["max_exposure_multiplier"] if monthly_income > 0 else max_by_product
 
-        if repayment["max_new_emi"] > 0:
+        if repayment.max_new_emi > 0:
             mid_tenure = desired_tenure if desired_tenure > 0 else (
                 (loan["tenure_range"][0] + loan["tenure_range"][1]) // 2
             )
-            max_by_emi = max_loan_from_emi(repayment["max_new_emi"], effective_rate, mid_tenure)
+            max_by_emi = max_loan_from_emi(repayment.max_new_emi, effective_rate, mid_tenure)
         else:
             max_by_emi = 0
 
@@ -1904,13 +2504,13 @@ def check_loan_eligibility(
                 verdict = "ELIGIBLE_WITH_CAUTION"
 
         # Check if EMI is affordable
-        if emi > repayment["max_new_emi"] and repayment["max_new_emi"] > 0:
+        if emi > repayment.max_new_emi and repayment.max_new_emi > 0:
             reasons_fail.append(
-                f"EMI Rs.{emi:,.0f} exceeds affordable EMI Rs.{repayment['max_new_emi']:,.0f}"
+                f"EMI Rs.{emi:,.0f} exceeds affordable EMI Rs.{repayment.max_new_emi:,.0f}"
             )
             gap_analysis.append({
                 "check": "EMI Affordability",
-                "current": f"Affordable: Rs.{repayment['max_new_emi']:,.0f}/mo",
+                "current": f"Affordable: Rs.{repayment.max_new_emi:,.0f}/mo",
                 "required": f"Rs.{emi:,.0f}/mo",
                 "gap": f"Reduce amount or extend tenure",
                 "difficulty": "Medium",
@@ -1935,39 +2535,9 @@ def check_loan_eligibility(
     # --- Improvement steps ---
     improvement_steps = []
     for gap in gap_analysis:
-        if gap["check"] == "Credit Score":
-            improvement_steps.extend([
-                f"Improve score by {gap['gap']} — pay bills on time, maintain consistent income records",
-                "Use Score Builder page to see exactly which criteria to improve",
-            ])
-        elif gap["check"] == "Monthly Income":
-            improvement_steps.extend([
-                f"Increase income by {gap['gap']} — consider supplementary income sources",
-                "After income improves, upload 6-month bank statement to verify",
-            ])
-        elif gap["check"] == "Loan Tier Access":
-            improvement_steps.extend([
-                "Focus on consistently paying utility bills on time",
-                "Get registered with Aadhaar + PAN for identity verification",
-                "Join an SHG or JLG group for initial credit access",
-            ])
-        elif gap["check"] == "Repayment Capacity":
-            improvement_steps.extend([
-                "Pay off or reduce existing loan EMIs first",
-                "Reduce monthly fixed expenses",
-                "Consider increasing income before applying",
-            ])
-        elif gap["check"] == "Loan Amount":
-            improvement_steps.extend([
-                f"Apply for a lower amount (max eligible: {loan_details.get('max_eligible_amount', 'N/A')})",
-                "Improve score / income to increase eligibility limit",
-            ])
-        elif gap["check"] == "EMI Affordability":
-            improvement_steps.extend([
-                "Choose a longer tenure to reduce monthly EMI",
-                "Apply for a smaller amount to bring EMI within budget",
-                "Pay off existing EMIs to free up capacity",
-            ])
+        steps = _IMPROVEMENT_STEPS.get(gap["check"])
+        if steps is not None:
+            improvement_steps.extend(steps(gap, loan_details))
 
     if not improvement_steps and not eligible:
         improvement_steps.append(
@@ -1997,15 +2567,13 @@ def check_loan_eligibility(
         "gap_analysis": gap_analysis,
         "loan_details": loan_details,
         "improvement_steps": improvement_steps,
-        "repayment_capacity": repayment,
+        "repayment_capacity": repayment.as_dict(),
     }
 
 
 def get_loan_categories() -> List[str]:
     """Return all unique loan categories across the full catalog."""
-    catalog = get_all_loans_catalog()
-    categories = sorted(set(loan.get("category", "") for loan in catalog if loan.get("category")))
-    return categories
+    return list(_LOAN_CATEGORIES)
 
 
 def get_seasonal_recommendations(persona: str,
@@ -2017,26 +2585,23 @@ def get_seasonal_recommendations(persona: str,
         return []
 
     recs = []
-    for season, info in CROP_SEASONS.items():
-        if current_month in info["months"] or current_month == info["apply_by"]:
-            recs.append({
-                "season": season,
-                "status": "Active" if current_month in info["months"] else "Apply Now",
-                "crops": info["crops"],
-                "recommended_loan": info["loan_type"],
-                "advice": (
-                    f"{season} season {'is active' if current_month in info['months'] else 'starts soon'}. "
-                    f"Apply for crop loan by {info['apply_by']} for best rates."
-                ),
-            })
+    for season, info, active in _SEASONS_BY_MONTH.get(current_month, ()):
+        recs.append({
+            "season": season,
+            "status": "Active" if active else "Apply Now",
+            "crops": info["crops"],
+            "recommended_loan": info["loan_type"],
+            "advice": (
+                f"{season} season {'is active' if active else 'starts soon'}. "
+                f"Apply for crop loan by {info['apply_by']} for best rates."
+            ),
+        })
 
     if not recs:
         # Find next upcoming season
-        all_months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
-                      "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
-        current_idx = all_months.index(current_month) if current_month in all_months else 0
+        current_idx = _MONTH_INDEX.get(current_month, 0)
         for season, info in CROP_SEASONS.items():
-            apply_idx = all_months.index(info["apply_by"]) if info["apply_by"] in all_months else 0
+            apply_idx = _MONTH_INDEX.get(info["apply_by"], 0)
             if apply_idx > current_idx:
                 recs.append({
                     "season": season,
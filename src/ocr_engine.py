@@ -17,7 +17,14 @@ import re
 import io
 import os
 import json
+import shutil
 import logging
+import tempfile
+import threading
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
@@ -56,20 +63,24 @@ try:
 except ImportError:
     pass
 
+# In-process Tesseract: no per-call fork, language data loaded once per thread.
+# Only located here; _get_tess_api imports it on first use, so OCR pool
+# workers can cap OpenMP before the library loads (see _init_ocr_worker).
+_TESSEROCR_AVAILABLE = importlib.util.find_spec("tesserocr") is not None
+if _TESSEROCR_AVAILABLE:
+    _TESSERACT_AVAILABLE = True
+
 try:
-    from PIL import Image, ImageFilter, ImageEnhance
+    from PIL import Image, ImageEnhance
     _PIL_AVAILABLE = True
 except ImportError:
     _PIL_AVAILABLE = False
 
 try:
     from pdf2image import convert_from_bytes
-    # pdf2image needs poppler
-    try:
-        convert_from_bytes(b"%PDF-1.0\n1 0 obj\n<< >>\nendobj\n", fmt="png", dpi=50)
-        _POPPLER_AVAILABLE = True
-    except Exception:
-        _POPPLER_AVAILABLE = False
+    # pdf2image shells out to poppler's pdftoppm (or pdftocairo); look for the
+    # binaries instead of rendering a probe PDF on every import
+    _POPPLER_AVAILABLE = bool(shutil.which("pdftoppm") or shutil.which("pdftocairo"))
 except ImportError:
     _POPPLER_AVAILABLE = False
 
@@ -79,6 +90,12 @@ try:
 except ImportError:
     _TABULA_AVAILABLE = False
 
+try:
+    import ahocorasick
+    _AHOCORASICK_AVAILABLE = True
+except ImportError:
+    _AHOCORASICK_AVAILABLE = False
+
 
 def get_ocr_capabilities() -> Dict[str, bool]:
     """Return which OCR capabilities are available."""
@@ -92,6 +109,21 @@ def get_ocr_capabilities() -> Dict[str, bool]:
 
 # ─── Image Pre-processing ──────────────────────────────────────────────────
 
+def _sharpen_binarize(img: "Image.Image") -> "Image.Image":
+    """
+    ImageFilter.SHARPEN then a threshold at 140, fused into one integer
+    NumPy pass. SHARPEN rounds (32·centre − 2·Σneighbours) / 16 and copies
+    the border, so an interior pixel comes out ≥ 140 exactly when
+    17·centre − (3×3 box sum) ≥ 1116; border pixels are thresholded as is.
+    """
+    pixels = np.asarray(img, dtype=np.int16)
+    ink = pixels >= 140
+    rows = pixels[:, :-2] + pixels[:, 1:-1] + pixels[:, 2:]
+    box = rows[:-2] + rows[1:-1] + rows[2:]
+    ink[1:-1, 1:-1] = 17 * pixels[1:-1, 1:-1] - box >= 1116
+    return Image.fromarray(ink.view(np.uint8) * np.uint8(255))
+
+
 def preprocess_image_for_ocr(image: "Image.Image") -> "Image.Image":
     """
     Pre-process an image to improve OCR accuracy.
@@ -110,19 +142,103 @@ def preprocess_image_for_ocr(image: "Image.Image") -> "Image.Image":
     enhancer = ImageEnhance.Contrast(img)
     img = enhancer.enhance(2.0)
 
-    # Sharpen
-    img = img.filter(ImageFilter.SHARPEN)
+    # Sharpen + simple binarization at 140, grayscale for tesseract
+    return _sharpen_binarize(img)
 
-    # Simple binarization: threshold at 128
-    img = img.point(lambda x: 0 if x < 140 else 255, "1")
 
-    # Convert back to grayscale for tesseract
-    img = img.convert("L")
+# ─── Core OCR Functions ────────────────────────────────────────────────────
 
-    return img
+# Tesseract flags shared by image and PDF-page OCR
+_TESSERACT_CONFIG = "--psm 6 --oem 3"  # Assume uniform block of text
 
+# Worker processes for multi-page OCR
+_OCR_WORKERS = os.cpu_count() or 1
+
+# Shared OCR worker pool, started on the first multi-page PDF and reused after
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _init_ocr_worker():
+    """
+    Pool initializer: cap each worker's Tesseract at one OpenMP thread.
+    N single-threaded Tesseract processes outrun OpenMP inside each one,
+    and setting it here keeps the parent process's OpenMP untouched.
+    Runs before the worker first imports tesserocr, so its OpenMP runtime
+    reads the limit; pytesseract's tesseract subprocesses inherit it.
+    """
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Return the shared OCR process pool, starting it on first use."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            # spawn, not fork: callers may be running other threads
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=_OCR_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_ocr_worker,
+            )
+        return _ocr_pool
+
+
+# Per-thread tesserocr APIs, keyed by language
+_tess_local = threading.local()
+
+
+def _get_tess_api(lang: str) -> "PyTessBaseAPI":
+    """Return this thread's tesserocr API for `lang`, initializing it on first use."""
+    apis = getattr(_tess_local, "apis", None)
+    if apis is None:
+        apis = _tess_local.apis = {}
+    api = apis.get(lang)
+    if api is None:
+        from tesserocr import PyTessBaseAPI, PSM, OEM
+        # Same settings as _TESSERACT_CONFIG
+        api = apis[lang] = PyTessBaseAPI(lang=lang, psm=PSM.SINGLE_BLOCK, oem=OEM.DEFAULT)
+    return api
+
+
+def _tesseract_to_string(processed: "Image.Image", lang: str) -> str:
+    """Run Tesseract on a pre-processed image, in-process when tesserocr is installed."""
+    if _TESSEROCR_AVAILABLE:
+        api = _get_tess_api(lang)
+        api.SetImage(processed)
+        return api.GetUTF8Text()
+    return pytesseract.image_to_string(processed, lang=lang, config=_TESSERACT_CONFIG)
+
+
+def _ocr_page(path: str, lang: str) -> str:
+    """Load, pre-process and Tesseract-OCR one rendered page image."""
+    with Image.open(path) as image:
+        processed = preprocess_image_for_ocr(image)
+    return _tesseract_to_string(processed, lang)
+
+
+def _ocr_pages(paths: List[str], lang: str, parallel: bool = True) -> List[str]:
+    """
+    OCR rendered page files, in order, on the shared worker pool (one page per
+    worker process, up to the CPU count), or serially in this thread when
+    `parallel` is off. Only paths cross the process boundary, and each page
+    is loaded just while it is being OCR'd.
+    """
+    global _ocr_pool
+    if not parallel or min(_OCR_WORKERS, len(paths)) <= 1:
+        return [_ocr_page(path, lang) for path in paths]
+    pool = _get_ocr_pool()
+    try:
+        return list(pool.map(_ocr_page, paths, [lang] * len(paths)))
+    except BrokenProcessPool:
+        # A worker died, or sent back an error that doesn't unpickle (some
+        # pytesseract errors); start a fresh pool next time
+        with _ocr_pool_lock:
+            if _ocr_pool is pool:
+                _ocr_pool = None
+        pool.shutdown(wait=False)
+        raise
 
-# ─── Core OCR Functions ────────────────────────────────────────────────────
 
 def ocr_image(image_bytes: bytes, lang: str = "eng") -> str:
     """
@@ -142,11 +258,7 @@ def ocr_image(image_bytes: bytes, lang: str = "eng") -> str:
     if _TESSERACT_AVAILABLE:
         try:
             processed = preprocess_image_for_ocr(img)
-            text = pytesseract.image_to_string(
-                processed,
-                lang=lang,
-                config="--psm 6 --oem 3",  # Assume uniform block of text
-            )
+            text = _tesseract_to_string(processed, lang)
             if text.strip():
                 return text.strip()
         except Exception as e:
@@ -180,10 +292,9 @@ def _extract_image_metadata(img: "Image.Image") -> str:
 
     # Check if it looks like a document (predominantly white background)
     try:
-        gray = img.convert("L")
-        pixels = list(gray.getdata())
-        avg_brightness = sum(pixels) / len(pixels)
-        white_pct = sum(1 for p in pixels if p > 200) / len(pixels)
+        pixels = np.asarray(img.convert("L"), dtype=np.uint8)
+        # int() so an empty image raises ZeroDivisionError, caught below
+        white_pct = int(np.count_nonzero(pixels > 200)) / pixels.size
 
         if white_pct > 0.6:
             parts.append("Document type: Likely a scanned document (high white background)")
@@ -193,8 +304,7 @@ def _extract_image_metadata(img: "Image.Image") -> str:
             parts.append("Document type: Photo or colored document")
 
         # Rough text density estimation
-        dark_pixels = sum(1 for p in pixels if p < 100)
-        text_density = dark_pixels / len(pixels)
+        text_density = int(np.count_nonzero(pixels < 100)) / pixels.size
         if text_density > 0.15:
             parts.append("Text density: High (likely text-heavy document)")
         elif text_density > 0.05:
@@ -207,47 +317,81 @@ def _extract_image_metadata(img: "Image.Image") -> str:
     return "\n".join(parts)
 
 
-def ocr_pdf_pages(pdf_bytes: bytes, lang: str = "eng", max_pages: int = 20) -> str:
+# Pages with less embedded text than this are treated as scanned and OCR'd
+_SCANNED_PAGE_CHARS = 50
+
+
+def _page_runs(pages: List[int]) -> List[Tuple[int, int]]:
+    """Group sorted 0-based page indices into inclusive (first, last) runs."""
+    runs = []
+    for page in pages:
+        if runs and runs[-1][1] == page - 1:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+def ocr_pdf_pages(pdf_bytes: bytes, lang: str = "eng", max_pages: int = 20,
+                  parallel: bool = True) -> str:
     """
-    Extract text from a scanned PDF by converting pages to images and OCR-ing.
-    Falls back to PyPDF2 if pdf2image/poppler unavailable.
+    Extract text from a PDF page by page: PyPDF2's embedded text where a page
+    has it, pdf2image + Tesseract only for pages that look scanned.
+    Falls back to OCR-ing embedded images if neither yields any text.
+
+    `parallel` spreads page rendering and OCR over all CPUs; with it off,
+    pages are rendered and OCR'd one at a time in the calling thread.
     """
     all_text = ""
 
-    # Strategy 1: pdf2image + Tesseract (best for scanned PDFs)
-    if _POPPLER_AVAILABLE and _TESSERACT_AVAILABLE:
-        try:
-            images = convert_from_bytes(pdf_bytes, dpi=300, fmt="png",
-                                         first_page=1, last_page=max_pages)
-            for i, img in enumerate(images):
-                processed = preprocess_image_for_ocr(img)
-                page_text = pytesseract.image_to_string(
-                    processed, lang=lang,
-                    config="--psm 6 --oem 3",
-                )
-                if page_text.strip():
-                    all_text += f"\n--- Page {i+1} ---\n{page_text}\n"
-            if all_text.strip():
-                return all_text.strip()
-        except Exception as e:
-            logger.warning(f"pdf2image OCR failed: {e}")
-
-    # Strategy 2: PyPDF2 text extraction (for text-based PDFs)
+    # Embedded text per page (PyPDF2)
+    reader = None
+    page_texts = []
+    read_all = False
     try:
         from PyPDF2 import PdfReader
         reader = PdfReader(io.BytesIO(pdf_bytes))
-        for i, page in enumerate(reader.pages[:max_pages]):
-            page_text = page.extract_text()
-            if page_text and page_text.strip():
-                all_text += f"\n--- Page {i+1} ---\n{page_text}\n"
+        for page in reader.pages[:max_pages]:
+            page_texts.append(page.extract_text() or "")
+        read_all = True
     except Exception as e:
         logger.warning(f"PyPDF2 extraction failed: {e}")
 
-    # Strategy 3: If PDF has embedded images, try to extract them
-    if not all_text.strip():
+    # Rasterize + Tesseract only the scanned pages (and any PyPDF2 couldn't read)
+    ocr_texts = {}
+    if _POPPLER_AVAILABLE and _TESSERACT_AVAILABLE:
+        scanned = [i for i, text in enumerate(page_texts)
+                   if len(text.strip()) < _SCANNED_PAGE_CHARS]
+        if not read_all:
+            scanned += range(len(page_texts), max_pages)
+        try:
+            # Render pages to disk rather than holding every 300 DPI page in memory
+            with tempfile.TemporaryDirectory() as output_folder:
+                paths, path_pages = [], []
+                for first, last in _page_runs(scanned):
+                    run_paths = convert_from_bytes(pdf_bytes, dpi=300, fmt="png",
+                                                   first_page=first + 1, last_page=last + 1,
+                                                   thread_count=_OCR_WORKERS if parallel else 1,
+                                                   output_folder=output_folder,
+                                                   paths_only=True)
+                    paths += run_paths
+                    path_pages += range(first, first + len(run_paths))
+                ocr_texts = dict(zip(path_pages, _ocr_pages(paths, lang, parallel)))
+        except Exception as e:
+            logger.warning(f"pdf2image OCR failed: {e}")
+
+    # Assemble in page order, preferring OCR text on the pages that were OCR'd
+    page_count = max(len(page_texts), max(ocr_texts, default=-1) + 1)
+    for i in range(page_count):
+        page_text = ocr_texts.get(i, "")
+        if not page_text.strip() and i < len(page_texts):
+            page_text = page_texts[i]
+        if page_text.strip():
+            all_text += f"\n--- Page {i+1} ---\n{page_text}\n"
+
+    # If PDF has embedded images, try to extract them
+    if not all_text.strip() and reader is not None:
         try:
-            from PyPDF2 import PdfReader
-            reader = PdfReader(io.BytesIO(pdf_bytes))
             for page in reader.pages[:max_pages]:
                 if hasattr(page, "images"):
                     for img_obj in page.images:
@@ -269,18 +413,9 @@ def extract_tables_from_pdf(pdf_bytes: bytes) -> List["pd.DataFrame"]:
         return []
 
     try:
-        import tempfile
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
-            f.write(pdf_bytes)
-            temp_path = f.name
-
-        try:
-            import tabula
-            tables = tabula.read_pdf(temp_path, pages="all", multiple_tables=True,
-                                      silent=True)
-            return [t for t in tables if len(t) > 0]
-        finally:
-            os.unlink(temp_path)
+        tables = tabula.read_pdf(io.BytesIO(pdf_bytes), pages="all", multiple_tables=True,
+                                  silent=True)
+        return [t for t in tables if len(t) > 0]
     except Exception as e:
         logger.warning(f"Tabula table extraction failed: {e}")
         return []
@@ -288,6 +423,50 @@ def extract_tables_from_pdf(pdf_bytes: bytes) -> List["pd.DataFrame"]:
 
 # ─── ID Card Parsers ────────────────────────────────────────────────────────
 
+# Parser patterns are compiled once here; each parser tries its tuples in order
+
+# Aadhaar number: 12 digits, often in groups of 4
+_AADHAAR_NUMBER_RES = (
+    re.compile(r'(\d{4}\s*\d{4}\s*\d{4})'),
+    re.compile(r'(\d{12})'),
+)
+_WHITESPACE_RE = re.compile(r'\s')
+_AADHAAR_NAME_RES = (
+    re.compile(r'(?:name|naam)[:\s]*([A-Z][a-zA-Z\s\.]+)', re.MULTILINE | re.IGNORECASE),
+    re.compile(r'^([A-Z][a-z]+ [A-Z][a-z]+(?:\s[A-Z][a-z]+)?)', re.MULTILINE | re.IGNORECASE),
+)
+_AADHAAR_DOB_RES = (
+    re.compile(r'(?:DOB|Date of Birth|Birth|Year of Birth)[:\s]*([\d]{2}[/-][\d]{2}[/-][\d]{2,4})',
+               re.IGNORECASE),
+    re.compile(r'(?:DOB|Date of Birth)[:\s]*([\d]{4})', re.IGNORECASE),
+    re.compile(r'(\d{2}/\d{2}/\d{4})', re.IGNORECASE),
+)
+_MALE_RE = re.compile(r'\b(male|पुरुष)\b', re.IGNORECASE)
+_FEMALE_RE = re.compile(r'\b(female|महिला|स्त्री)\b', re.IGNORECASE)
+_ADDRESS_RE = re.compile(r'(?:address|पता)[:\s]*(.+?)(?:\n\n|\Z)', re.IGNORECASE | re.DOTALL)
+
+# PAN: 5 letters + 4 digits + 1 letter (e.g., ABCDE1234F)
+_PAN_NUMBER_RE = re.compile(r'([A-Z]{5}\d{4}[A-Z])')
+_PAN_NAME_RE = re.compile(r'(?:name|naam)[:\s]*([A-Z][a-zA-Z\s\.]+)', re.IGNORECASE)
+_DATE_DMY_RE = re.compile(r'(\d{2}/\d{2}/\d{4})')
+
+# EPIC number: typically starts with state code letters + digits
+_EPIC_RES = (
+    re.compile(r'(?:EPIC|No)[:\s]*([A-Z]{2,3}/?\d{2,3}/?\w+/?\d+)', re.IGNORECASE),
+    re.compile(r'([A-Z]{3}\d{7})', re.IGNORECASE),
+)
+_VOTER_NAME_RE = re.compile(r'(?:name|elector)[:\s]*([A-Z][a-zA-Z\s\.]+)', re.IGNORECASE)
+_VOTER_AGE_RE = re.compile(r'(?:age|आयु)[:\s]*(\d{2})', re.IGNORECASE)
+
+_RATION_CARD_NO_RE = re.compile(r'(?:card|no)[:\s]*([A-Z]{2}[-/]?\w+[-/]?\d+)', re.IGNORECASE)
+_RATION_CARD_TYPE_RES = (
+    ("BPL", re.compile(r'\bBPL\b|below poverty', re.IGNORECASE)),
+    ("APL", re.compile(r'\bAPL\b|above poverty', re.IGNORECASE)),
+    ("AAY", re.compile(r'\bAAY\b|antyodaya', re.IGNORECASE)),
+)
+_FAMILY_MEMBERS_RE = re.compile(r'(?:members|family)[:\s]*(\d+)', re.IGNORECASE)
+
+
 def parse_aadhaar_card(text: str) -> Dict[str, Any]:
     """
     Parse Aadhaar card text (from OCR or text PDF).
@@ -299,15 +478,11 @@ def parse_aadhaar_card(text: str) -> Dict[str, Any]:
         "valid": False,
     }
 
-    # Aadhaar number: 12 digits, often in groups of 4
-    aadhaar_patterns = [
-        r'(\d{4}\s*\d{4}\s*\d{4})',
-        r'(\d{12})',
-    ]
-    for p in aadhaar_patterns:
-        m = re.search(p, text)
+    # Aadhaar number
+    for pattern in _AADHAAR_NUMBER_RES:
+        m = pattern.search(text)
         if m:
-            num = re.sub(r'\s', '', m.group(1))
+            num = _WHITESPACE_RE.sub('', m.group(1))
             if len(num) == 12:
                 # Mask for privacy
                 data["aadhaar_masked"] = f"XXXX XXXX {num[-4:]}"
@@ -315,12 +490,8 @@ def parse_aadhaar_card(text: str) -> Dict[str, Any]:
                 break
 
     # Name
-    name_patterns = [
-        r'(?:name|naam)[:\s]*([A-Z][a-zA-Z\s\.]+)',
-        r'^([A-Z][a-z]+ [A-Z][a-z]+(?:\s[A-Z][a-z]+)?)',
-    ]
-    for p in name_patterns:
-        m = re.search(p, text, re.MULTILINE | re.IGNORECASE)
+    for pattern in _AADHAAR_NAME_RES:
+        m = pattern.search(text)
         if m:
             name = m.group(1).strip()
             if len(name) > 3 and len(name) < 80:
@@ -328,28 +499,20 @@ def parse_aadhaar_card(text: str) -> Dict[str, Any]:
                 break
 
     # Date of Birth
-    dob_patterns = [
-        r'(?:DOB|Date of Birth|Birth|Year of Birth)[:\s]*([\d]{2}[/-][\d]{2}[/-][\d]{2,4})',
-        r'(?:DOB|Date of Birth)[:\s]*([\d]{4})',
-        r'(\d{2}/\d{2}/\d{4})',
-    ]
-    for p in dob_patterns:
-        m = re.search(p, text, re.IGNORECASE)
+    for pattern in _AADHAAR_DOB_RES:
+        m = pattern.search(text)
         if m:
             data["dob"] = m.group(1)
             break
 
     # Gender
-    if re.search(r'\b(male|पुरुष)\b', text, re.IGNORECASE):
+    if _MALE_RE.search(text):
         data["gender"] = "Male"
-    elif re.search(r'\b(female|महिला|स्त्री)\b', text, re.IGNORECASE):
+    elif _FEMALE_RE.search(text):
         data["gender"] = "Female"
 
     # Address (rough extraction)
-    addr_m = re.search(
-        r'(?:address|पता)[:\s]*(.+?)(?:\n\n|\Z)',
-        text, re.IGNORECASE | re.DOTALL
-    )
+    addr_m = _ADDRESS_RE.search(text)
     if addr_m:
         data["address"] = addr_m.group(1).strip()[:200]
 
@@ -367,19 +530,19 @@ def parse_pan_card(text: str) -> Dict[str, Any]:
         "valid": False,
     }
 
-    # PAN: 5 letters + 4 digits + 1 letter (e.g., ABCDE1234F)
-    pan_match = re.search(r'([A-Z]{5}\d{4}[A-Z])', text.upper())
+    # PAN number
+    pan_match = _PAN_NUMBER_RE.search(text.upper())
     if pan_match:
         data["pan_number"] = pan_match.group(1)
         data["valid"] = True
 
     # Name
-    name_m = re.search(r'(?:name|naam)[:\s]*([A-Z][a-zA-Z\s\.]+)', text, re.IGNORECASE)
+    name_m = _PAN_NAME_RE.search(text)
     if name_m:
         data["name"] = name_m.group(1).strip()
 
     # DOB
-    dob_m = re.search(r'(\d{2}/\d{2}/\d{4})', text)
+    dob_m = _DATE_DMY_RE.search(text)
     if dob_m:
         data["dob"] = dob_m.group(1)
 
@@ -397,25 +560,21 @@ def parse_voter_id(text: str) -> Dict[str, Any]:
         "valid": False,
     }
 
-    # EPIC number: typically starts with state code letters + digits
-    epic_patterns = [
-        r'(?:EPIC|No)[:\s]*([A-Z]{2,3}/?\d{2,3}/?\w+/?\d+)',
-        r'([A-Z]{3}\d{7})',
-    ]
-    for p in epic_patterns:
-        m = re.search(p, text, re.IGNORECASE)
+    # EPIC number
+    for pattern in _EPIC_RES:
+        m = pattern.search(text)
         if m:
             data["epic_number"] = m.group(1)
             data["valid"] = True
             break
 
     # Name
-    name_m = re.search(r'(?:name|elector)[:\s]*([A-Z][a-zA-Z\s\.]+)', text, re.IGNORECASE)
+    name_m = _VOTER_NAME_RE.search(text)
     if name_m:
         data["name"] = name_m.group(1).strip()
 
     # Age / DOB
-    age_m = re.search(r'(?:age|आयु)[:\s]*(\d{2})', text, re.IGNORECASE)
+    age_m = _VOTER_AGE_RE.search(text)
     if age_m:
         data["age"] = int(age_m.group(1))
 
@@ -431,21 +590,19 @@ def parse_ration_card(text: str) -> Dict[str, Any]:
     }
 
     # Card number
-    card_m = re.search(r'(?:card|no)[:\s]*([A-Z]{2}[-/]?\w+[-/]?\d+)', text, re.IGNORECASE)
+    card_m = _RATION_CARD_NO_RE.search(text)
     if card_m:
         data["card_number"] = card_m.group(1)
         data["valid"] = True
 
     # Card type
-    if re.search(r'\bBPL\b|below poverty', text, re.IGNORECASE):
-        data["card_type"] = "BPL"
-    elif re.search(r'\bAPL\b|above poverty', text, re.IGNORECASE):
-        data["card_type"] = "APL"
-    elif re.search(r'\bAAY\b|antyodaya', text, re.IGNORECASE):
-        data["card_type"] = "AAY"
+    for card_type, pattern in _RATION_CARD_TYPE_RES:
+        if pattern.search(text):
+            data["card_type"] = card_type
+            break
 
     # Family members
-    members_m = re.search(r'(?:members|family)[:\s]*(\d+)', text, re.IGNORECASE)
+    members_m = _FAMILY_MEMBERS_RE.search(text)
     if members_m:
         data["family_members"] = int(members_m.group(1))
 
@@ -454,6 +611,40 @@ def parse_ration_card(text: str) -> Dict[str, Any]:
 
 # ─── Marksheet / Grade Card Parsers ─────────────────────────────────────────
 
+_UNIVERSITY_RES = (
+    re.compile(r'(?:university|vishwavidyalaya|deemed)[:\s]*(.+?)(?:\n|$)',
+               re.IGNORECASE | re.MULTILINE),
+    re.compile(r'^([A-Z][A-Za-z\s]+(?:University|Institute|College))',
+               re.IGNORECASE | re.MULTILINE),
+)
+_USN_RES = (
+    re.compile(r'(?:USN|Roll\s*No|Reg\s*No|Enroll)[:\s.]*([A-Z0-9]{8,15})', re.IGNORECASE),
+    re.compile(r'(?:USN|Roll)[:\s.]*(\d{2}[A-Z]{2,4}\d{2,3}[A-Z]{2,3}\d{2,3})', re.IGNORECASE),
+)
+_BRANCH_RES = (
+    re.compile(r'(?:branch|dept|department|programme|program|course)[:\s]*(.+?)(?:\n|$)',
+               re.IGNORECASE),
+    re.compile(r'(Computer Science|Information Technology|Electronics|Mechanical|Civil|'
+               r'Electrical|Chemical|Data Science|AI|Artificial Intelligence)', re.IGNORECASE),
+)
+_SGPA_RE = re.compile(r'(?:SGPA|SPI)(?!.*CGPA)[:\s]*(\d+\.?\d*)', re.IGNORECASE)
+_CGPA_RE = re.compile(r'(?:CGPA|CPI|Aggregate|Overall|Cumulative)[:\s]*(\d+\.?\d*)', re.IGNORECASE)
+_PERCENTAGE_RE = re.compile(r'(?:percentage|percent|marks)[:\s]*(\d+\.?\d*)\s*%?', re.IGNORECASE)
+_SEMESTER_RE = re.compile(r'sem(?:ester)?\s*(\d+)', re.IGNORECASE)
+# Subject row: Subject Name ... marks[/max] [status]
+_SUBJECT_ROW_RE = re.compile(
+    r'([A-Za-z][A-Za-z\s&]+?)\s+(\d{2,3})\s*/?\s*(\d{2,3})?\s*(P|F|AB|pass|fail)?',
+    re.IGNORECASE,
+)
+_BACKLOG_COUNT_RE = re.compile(r'backlog[s]?[:\s]*(\d+)', re.IGNORECASE)
+_NO_BACKLOG_RE = re.compile(r'no\s*backlog|0\s*backlog|all\s*pass', re.IGNORECASE)
+_DIVISION_RES = (
+    ("Distinction", re.compile(r'first\s*class\s*with\s*dist|distinction', re.IGNORECASE)),
+    ("First Class", re.compile(r'first\s*class', re.IGNORECASE)),
+    ("Second Class", re.compile(r'second\s*class', re.IGNORECASE)),
+)
+
+
 def parse_marksheet(text: str) -> Dict[str, Any]:
     """
     Parse marksheet / grade card / transcript.
@@ -464,49 +655,36 @@ def parse_marksheet(text: str) -> Dict[str, Any]:
     }
 
     # University / Institution
-    uni_patterns = [
-        r'(?:university|vishwavidyalaya|deemed)[:\s]*(.+?)(?:\n|$)',
-        r'^([A-Z][A-Za-z\s]+(?:University|Institute|College))',
-    ]
-    for p in uni_patterns:
-        m = re.search(p, text, re.IGNORECASE | re.MULTILINE)
+    for pattern in _UNIVERSITY_RES:
+        m = pattern.search(text)
         if m:
             data["university"] = m.group(1).strip()[:100]
             break
 
     # USN / Roll Number
-    usn_patterns = [
-        r'(?:USN|Roll\s*No|Reg\s*No|Enroll)[:\s.]*([A-Z0-9]{8,15})',
-        r'(?:USN|Roll)[:\s.]*(\d{2}[A-Z]{2,4}\d{2,3}[A-Z]{2,3}\d{2,3})',
-    ]
-    for p in usn_patterns:
-        m = re.search(p, text, re.IGNORECASE)
+    for pattern in _USN_RES:
+        m = pattern.search(text)
         if m:
             data["usn"] = m.group(1)
             break
 
     # Branch / Department
-    branch_patterns = [
-        r'(?:branch|dept|department|programme|program|course)[:\s]*(.+?)(?:\n|$)',
-        r'(Computer Science|Information Technology|Electronics|Mechanical|Civil|'
-        r'Electrical|Chemical|Data Science|AI|Artificial Intelligence)',
-    ]
-    for p in branch_patterns:
-        m = re.search(p, text, re.IGNORECASE)
+    for pattern in _BRANCH_RES:
+        m = pattern.search(text)
         if m:
             data["branch"] = m.group(1).strip()[:60]
             break
 
     # CGPA / SGPA extraction
     sgpas = []
-    for m in re.finditer(r'(?:SGPA|SPI)(?!.*CGPA)[:\s]*(\d+\.?\d*)', text, re.IGNORECASE):
+    for m in _SGPA_RE.finditer(text):
         val = float(m.group(1))
         if 0 < val <= 10:
             sgpas.append(val)
     data["sgpa_list"] = sgpas
 
     # Aggregate CGPA
-    cgpa_m = re.search(r'(?:CGPA|CPI|Aggregate|Overall|Cumulative)[:\s]*(\d+\.?\d*)', text, re.IGNORECASE)
+    cgpa_m = _CGPA_RE.search(text)
     if cgpa_m:
         val = float(cgpa_m.group(1))
         if 0 < val <= 10:
@@ -515,24 +693,20 @@ def parse_marksheet(text: str) -> Dict[str, Any]:
         data["cgpa"] = round(np.mean(sgpas), 2)
 
     # Percentage
-    pct_m = re.search(r'(?:percentage|percent|marks)[:\s]*(\d+\.?\d*)\s*%?', text, re.IGNORECASE)
+    pct_m = _PERCENTAGE_RE.search(text)
     if pct_m:
         val = float(pct_m.group(1))
         if 0 < val <= 100:
             data["percentage"] = val
 
     # Semester count
-    sem_matches = re.findall(r'sem(?:ester)?\s*(\d+)', text, re.IGNORECASE)
+    sem_matches = _SEMESTER_RE.findall(text)
     if sem_matches:
         data["semesters"] = max(int(s) for s in sem_matches)
 
     # Subject-wise marks (table format)
     subjects = []
-    # Pattern: Subject Name ... marks/grade
-    for m in re.finditer(
-        r'([A-Za-z][A-Za-z\s&]+?)\s+(\d{2,3})\s*/?\s*(\d{2,3})?\s*(P|F|AB|pass|fail)?',
-        text, re.IGNORECASE
-    ):
+    for m in _SUBJECT_ROW_RE.finditer(text):
         subj = {
             "name": m.group(1).strip(),
             "marks": int(m.group(2)),
@@ -553,25 +727,32 @@ def parse_marksheet(text: str) -> Dict[str, Any]:
 
     # Backlogs
     failed = sum(1 for s in subjects if s.get("status") in ["F", "FAIL", "AB"])
-    backlog_m = re.search(r'backlog[s]?[:\s]*(\d+)', text, re.IGNORECASE)
+    backlog_m = _BACKLOG_COUNT_RE.search(text)
     if backlog_m:
         data["backlogs"] = int(backlog_m.group(1))
-    elif re.search(r'no\s*backlog|0\s*backlog|all\s*pass', text, re.IGNORECASE):
+    elif _NO_BACKLOG_RE.search(text):
         data["backlogs"] = 0
     else:
         data["backlogs"] = failed
 
     # Class / Division
-    if re.search(r'first\s*class\s*with\s*dist|distinction', text, re.IGNORECASE):
-        data["division"] = "Distinction"
-    elif re.search(r'first\s*class', text, re.IGNORECASE):
-        data["division"] = "First Class"
-    elif re.search(r'second\s*class', text, re.IGNORECASE):
-        data["division"] = "Second Class"
+    for division, pattern in _DIVISION_RES:
+        if pattern.search(text):
+            data["division"] = division
+            break
 
     return data
 
 
+_CERTIFICATE_TITLE_RE = re.compile(
+    r'(?:certificate|certif)[:\s]+(?:of|in|for)[:\s]+(.+?)(?:\n|$)', re.IGNORECASE
+)
+_CERTIFICATE_GRADE_RE = re.compile(r'(?:grade|score|result)[:\s]*(.+?)(?:\n|$)', re.IGNORECASE)
+_CERTIFICATE_DATE_RE = re.compile(
+    r'(?:date|issued)[:\s]*(\d{2}[/-]\d{2}[/-]\d{2,4})', re.IGNORECASE
+)
+
+
 def parse_certificate(text: str) -> Dict[str, Any]:
     """
     Parse a certificate document (course completion, skill certification, etc.).
@@ -581,10 +762,7 @@ def parse_certificate(text: str) -> Dict[str, Any]:
     }
 
     # Certificate title
-    title_m = re.search(
-        r'(?:certificate|certif)[:\s]+(?:of|in|for)[:\s]+(.+?)(?:\n|$)',
-        text, re.IGNORECASE
-    )
+    title_m = _CERTIFICATE_TITLE_RE.search(text)
     if title_m:
         data["title"] = title_m.group(1).strip()[:100]
 
@@ -601,7 +779,7 @@ def parse_certificate(text: str) -> Dict[str, Any]:
             break
 
     # Grade / Score
-    grade_m = re.search(r'(?:grade|score|result)[:\s]*(.+?)(?:\n|$)', text, re.IGNORECASE)
+    grade_m = _CERTIFICATE_GRADE_RE.search(text)
     if grade_m:
         data["grade"] = grade_m.group(1).strip()
 
@@ -610,13 +788,22 @@ def parse_certificate(text: str) -> Dict[str, Any]:
                                                         "government", "govt"])
 
     # Date
-    date_m = re.search(r'(?:date|issued)[:\s]*(\d{2}[/-]\d{2}[/-]\d{2,4})', text, re.IGNORECASE)
+    date_m = _CERTIFICATE_DATE_RE.search(text)
     if date_m:
         data["issue_date"] = date_m.group(1)
 
     return data
 
 
+_SURVEY_NO_RE = re.compile(r'(?:survey|sy|khata|patta)[:\s.]*(?:no)?[:\s.]*(\w+)', re.IGNORECASE)
+_ACRES_RE = re.compile(r'(\d+\.?\d*)\s*(?:acres?|ac)', re.IGNORECASE)
+_HECTARES_RE = re.compile(r'(\d+\.?\d*)\s*(?:hectares?|ha)', re.IGNORECASE)
+_GUNTHAS_RE = re.compile(r'(\d+\.?\d*)\s*(?:gunthas?|guntha)', re.IGNORECASE)
+_IRRIGATED_RE = re.compile(r'irrigat', re.IGNORECASE)
+_RAINFED_RE = re.compile(r'rain.?fed|dry', re.IGNORECASE)
+_OWNER_NAME_RE = re.compile(r'(?:owner|name|holder)[:\s]*([A-Z][a-zA-Z\s\.]+)', re.IGNORECASE)
+
+
 def parse_land_record(text: str) -> Dict[str, Any]:
     """
     Parse land record document (RTC, Patta, Khata).
@@ -626,14 +813,14 @@ def parse_land_record(text: str) -> Dict[str, Any]:
     }
 
     # Survey / Khata number
-    survey_m = re.search(r'(?:survey|sy|khata|patta)[:\s.]*(?:no)?[:\s.]*(\w+)', text, re.IGNORECASE)
+    survey_m = _SURVEY_NO_RE.search(text)
     if survey_m:
         data["survey_no"] = survey_m.group(1)
 
     # Land area
-    acres_m = re.search(r'(\d+\.?\d*)\s*(?:acres?|ac)', text, re.IGNORECASE)
-    hectare_m = re.search(r'(\d+\.?\d*)\s*(?:hectares?|ha)', text, re.IGNORECASE)
-    guntha_m = re.search(r'(\d+\.?\d*)\s*(?:gunthas?|guntha)', text, re.IGNORECASE)
+    acres_m = _ACRES_RE.search(text)
+    hectare_m = _HECTARES_RE.search(text)
+    guntha_m = _GUNTHAS_RE.search(text)
 
     if acres_m:
         data["land_acres"] = float(acres_m.group(1))
@@ -643,19 +830,32 @@ def parse_land_record(text: str) -> Dict[str, Any]:
         data["land_acres"] = float(guntha_m.group(1)) / 40  # 40 guntha = 1 acre
 
     # Land type
-    if re.search(r'irrigat', text, re.IGNORECASE):
+    if _IRRIGATED_RE.search(text):
         data["land_type"] = "irrigated"
-    elif re.search(r'rain.?fed|dry', text, re.IGNORECASE):
+    elif _RAINFED_RE.search(text):
         data["land_type"] = "rainfed"
 
     # Owner name
-    owner_m = re.search(r'(?:owner|name|holder)[:\s]*([A-Z][a-zA-Z\s\.]+)', text, re.IGNORECASE)
+    owner_m = _OWNER_NAME_RE.search(text)
     if owner_m:
         data["owner_name"] = owner_m.group(1).strip()
 
     return data
 
 
+# Bill type checks in priority order; the first match also sets has_<type>
+_UTILITY_TYPE_RES = (
+    ("electricity", re.compile(r'electric|bescom|hescom|msedcl|power|eb\s', re.IGNORECASE)),
+    ("water", re.compile(r'water|bwssb|jal\s', re.IGNORECASE)),
+    ("gas", re.compile(r'gas|lpg|cylinder|piped\s*gas', re.IGNORECASE)),
+)
+_CONSUMER_NO_RE = re.compile(
+    r'(?:consumer|account|conn)[:\s.]*(?:no)?[:\s.]*([A-Z]{0,3}[-/]?\d{5,15})', re.IGNORECASE
+)
+_BILL_PAID_RE = re.compile(r'paid|payment received|thank you', re.IGNORECASE)
+_BILL_DUE_RE = re.compile(r'overdue|pending|due', re.IGNORECASE)
+
+
 def parse_utility_bill(text: str) -> Dict[str, Any]:
     """Parse utility bill (electricity, water, gas)."""
     data = {
@@ -663,19 +863,14 @@ def parse_utility_bill(text: str) -> Dict[str, Any]:
     }
 
     # Bill type
-    if re.search(r'electric|bescom|hescom|msedcl|power|eb\s', text, re.IGNORECASE):
-        data["utility_type"] = "electricity"
-        data["has_electricity"] = True
-    elif re.search(r'water|bwssb|jal\s', text, re.IGNORECASE):
-        data["utility_type"] = "water"
-        data["has_water"] = True
-    elif re.search(r'gas|lpg|cylinder|piped\s*gas', text, re.IGNORECASE):
-        data["utility_type"] = "gas"
-        data["has_gas"] = True
+    for utility_type, pattern in _UTILITY_TYPE_RES:
+        if pattern.search(text):
+            data["utility_type"] = utility_type
+            data[f"has_{utility_type}"] = True
+            break
 
     # Consumer number
-    consumer_m = re.search(r'(?:consumer|account|conn)[:\s.]*(?:no)?[:\s.]*([A-Z]{0,3}[-/]?\d{5,15})',
-                            text, re.IGNORECASE)
+    consumer_m = _CONSUMER_NO_RE.search(text)
     if consumer_m:
         data["consumer_no"] = consumer_m.group(1)
 
@@ -686,9 +881,9 @@ def parse_utility_bill(text: str) -> Dict[str, Any]:
         data["bill_amount"] = amounts[0]
 
     # Due date / payment status
-    if re.search(r'paid|payment received|thank you', text, re.IGNORECASE):
+    if _BILL_PAID_RE.search(text):
         data["paid"] = True
-    elif re.search(r'overdue|pending|due', text, re.IGNORECASE):
+    elif _BILL_DUE_RE.search(text):
         data["paid"] = False
 
     return data
@@ -738,6 +933,20 @@ DOCUMENT_TYPES = {
     },
 }
 
+# Keyword → doc types listing it, and (with pyahocorasick) one automaton
+# over every keyword so classification is a single pass over the text
+_KEYWORD_DOC_TYPES: Dict[str, List[str]] = {}
+for _doc_type, _config in DOCUMENT_TYPES.items():
+    for _kw in _config["keywords"]:
+        _KEYWORD_DOC_TYPES.setdefault(_kw, []).append(_doc_type)
+
+_KEYWORD_AUTOMATON = None
+if _AHOCORASICK_AVAILABLE:
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _kw in _KEYWORD_DOC_TYPES:
+        _KEYWORD_AUTOMATON.add_word(_kw, _kw)
+    _KEYWORD_AUTOMATON.make_automaton()
+
 
 def classify_document(text: str) -> Tuple[str, float, Dict]:
     """
@@ -749,9 +958,20 @@ def classify_document(text: str) -> Tuple[str, float, Dict]:
     text_lower = text.lower()
     scores = {}
 
+    if _KEYWORD_AUTOMATON is not None:
+        # Each keyword counts once, however often it occurs
+        counts = dict.fromkeys(DOCUMENT_TYPES, 0)
+        for kw in {kw for _, kw in _KEYWORD_AUTOMATON.iter(text_lower)}:
+            for doc_type in _KEYWORD_DOC_TYPES[kw]:
+                counts[doc_type] += 1
+    else:
+        counts = {
+            doc_type: sum(1 for kw in config["keywords"] if kw in text_lower)
+            for doc_type, config in DOCUMENT_TYPES.items()
+        }
+
     for doc_type, config in DOCUMENT_TYPES.items():
-        count = sum(1 for kw in config["keywords"] if kw in text_lower)
-        scores[doc_type] = count / len(config["keywords"]) if config["keywords"] else 0
+        scores[doc_type] = counts[doc_type] / len(config["keywords"]) if config["keywords"] else 0
 
     if not scores or max(scores.values()) == 0:
         return "unknown", 0.0, {}
@@ -768,7 +988,8 @@ def classify_document(text: str) -> Tuple[str, float, Dict]:
 
 # ─── Enhanced File Processing ───────────────────────────────────────────────
 
-def process_file_with_ocr(file_bytes: bytes, filename: str) -> Dict[str, Any]:
+def process_file_with_ocr(file_bytes: bytes, filename: str,
+                          parallel: bool = True) -> Dict[str, Any]:
     """
     Process a file with full OCR support. Handles:
     - Text PDFs (PyPDF2)
@@ -777,6 +998,8 @@ def process_file_with_ocr(file_bytes: bytes, filename: str) -> Dict[str, Any]:
     - CSV / Excel (pandas)
     - Text files
 
+    `parallel` is passed to ocr_pdf_pages for scanned PDFs.
+
     Returns:
         Dict with: text, dataframe, document_type, parsed_data,
                     ocr_used, tables, warnings
@@ -824,7 +1047,7 @@ def process_file_with_ocr(file_bytes: bytes, filename: str) -> Dict[str, Any]:
 
         # If very little text, it's probably a scanned PDF — use OCR
         if len(result["text"].strip()) < 50:
-            ocr_text = ocr_pdf_pages(file_bytes)
+            ocr_text = ocr_pdf_pages(file_bytes, parallel=parallel)
             if ocr_text:
                 result["text"] = ocr_text
                 result["ocr_used"] = True
@@ -864,7 +1087,8 @@ def process_file_with_ocr(file_bytes: bytes, filename: str) -> Dict[str, Any]:
 
     elif ext == ".json":
         try:
-            data = json.loads(file_bytes.decode("utf-8"))
+            # json.loads reads the bytes directly; no separate decode pass
+            data = json.loads(file_bytes)
             result["text"] = json.dumps(data, indent=2)
         except Exception:
             result["text"] = file_bytes.decode("utf-8", errors="ignore")
@@ -885,6 +1109,21 @@ def process_file_with_ocr(file_bytes: bytes, filename: str) -> Dict[str, Any]:
     return result
 
 
+def batch_process_files(files: List[Tuple[bytes, str]]) -> List[Dict[str, Any]]:
+    """
+    Run process_file_with_ocr over (file_bytes, filename) pairs on a thread
+    pool. Tesseract runs outside the GIL (as a subprocess, or inside
+    tesserocr), so files OCR in parallel; results keep the input order.
+    Each thread handles its PDF's pages serially, so the batch as a whole
+    keeps to one Tesseract per CPU rather than a page pool per file.
+    """
+    workers = min(_OCR_WORKERS, len(files))
+    if workers <= 1:
+        return [process_file_with_ocr(data, name) for data, name in files]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda f: process_file_with_ocr(*f, parallel=False), files))
+
+
 # ─── Merge parsed data into persona-compatible format ────────────────────────
 
 def merge_parsed_into_persona_data(
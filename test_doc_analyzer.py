@@ -5,8 +5,9 @@ import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.document_analyzer import (
-    analyze_documents, auto_detect_persona,
-    SAMPLE_GENERATORS, PERSONA_EXTRACTORS,
+    analyze_documents, auto_detect_persona, check_document_relevance,
+    SAMPLE_GENERATORS, PERSONA_EXTRACTORS, TextView,
+    find_number_near, find_percentage,
 )
 from src.alternative_profiles import compute_persona_score, PERSONAS
 
@@ -76,6 +77,34 @@ def test_auto_detection():
     return passed == len(results)
 
 
+def test_text_view_matches_raw_text():
+    """Extractors must give identical results for a TextView and a raw string."""
+    for persona_key, generator in SAMPLE_GENERATORS.items():
+        doc_text = generator()
+        view = TextView.from_text(doc_text)
+        assert auto_detect_persona(view) == auto_detect_persona(doc_text)
+        assert check_document_relevance(view) == check_document_relevance(doc_text)
+        extractor = PERSONA_EXTRACTORS[persona_key]
+        assert extractor(view, None) == extractor(doc_text, None)
+
+
+def test_numeric_context_lookups():
+    """The one-pass numeric index must agree with the per-keyword regexes."""
+    samples = [
+        "Land Area: 4.5 Acres, since 2014",
+        "Paid on time: 85% (timely 90 percent)",
+        "1.5.2 acres and 45 % timely",
+        "Recharge: Monthly plan ₹299",
+        "no numbers here",
+    ]
+    keyword_sets = [["acre", "acres"], ["since"], ["on time", "timely"], ["recharge", "plan"]]
+    for text in samples:
+        view = TextView.from_text(text)
+        for kws in keyword_sets:
+            assert find_number_near(view, kws) == find_number_near(text, kws)
+            assert find_percentage(view, kws) == find_percentage(text, kws)
+
+
 def test_empty_documents():
     """Test handling of empty/minimal documents."""
     print(f"\n{'='*60}")
@@ -141,6 +170,8 @@ if __name__ == "__main__":
     test_auto_detection()
 
     # Edge cases
+    test_text_view_matches_raw_text()
+    test_numeric_context_lookups()
     test_empty_documents()
     test_multi_file_upload()
 
@@ -10,14 +10,17 @@ import sys, os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.loan_engine import (
-    calculate_emi, calculate_total_interest,
-    analyze_repayment_capacity, max_loan_from_emi,
+    calculate_emi, calculate_total_interest, calculate_total_interest_vec,
+    analyze_repayment_capacity, repayment_capacity, decode_flags, max_loan_from_emi,
     get_score_tier, get_transaction_loan_recommendations,
     get_persona_loan_recommendations, compare_loans,
     get_financial_tips, get_seasonal_recommendations,
     generate_repayment_schedule, SCORE_TIERS,
     TRANSACTION_LOANS, PERSONA_LOANS,
+    get_all_loans_catalog, tier_for,
+    calculate_emi_batch,
 )
+import numpy as np
 
 
 def test_emi_calculation():
@@ -50,6 +53,11 @@ def test_total_interest():
     # Zero rate → zero interest
     assert calculate_total_interest(100000, 0, 12) == 0.0
 
+    # Vectorized form matches the scalar one element-wise
+    terms = [(100000, 12.0, 12), (100000, 0, 12), (250000.5, 9.25, 36), (5000, 18.0, 0)]
+    vec = calculate_total_interest_vec(*(np.array(col, dtype=float) for col in zip(*terms)))
+    assert list(vec) == [calculate_total_interest(*t) for t in terms]
+
     print("  ✓ Total interest: PASS")
 
 
@@ -83,6 +91,19 @@ def test_repayment_capacity():
     rep3 = analyze_repayment_capacity(0, 0, 0, 0.40)
     assert rep3["verdict"] == "NOT_ELIGIBLE"
 
+    # Typed result carries the same fields as the dict form
+    cap = repayment_capacity(30000, 15000, 18000, 0.40)
+    assert cap.verdict == "NOT_ELIGIBLE"
+    assert cap.as_dict() == rep2
+    assert decode_flags(cap.flags, cap.foir_exact, cap.foir_limit) == rep2["risk_flags"]
+    assert decode_flags(0) == []
+
+    # FOIR just under a half-percent boundary: 18075.97 / 23325 = 0.774961...
+    # reads 77%, though the 4-decimal current_foir (0.775) would round to 78%
+    rep4 = analyze_repayment_capacity(23325, 0, 18075.97, 0.40)
+    assert rep4["current_foir"] == 0.775
+    assert "FOIR exceeded: 77% > 40% limit" in rep4["risk_flags"]
+
     print("  ✓ Repayment capacity analysis: PASS")
 
 
@@ -540,6 +561,70 @@ def test_interest_saved_via_subsidy():
     print("  ✓ Subsidy interest savings: PASS")
 
 
+def test_tier_for_array():
+    """Vectorized tier lookup matches the scalar resolver."""
+    scores = np.array([250, 300, 399, 399.5, 400, 649, 650, 749, 750, 900, 950])
+    keys = tier_for(scores)
+    assert list(keys) == [get_score_tier(float(s))["tier_key"] for s in scores]
+
+    print("  ✓ Vectorized tier lookup: PASS")
+
+
+def test_emi_batch():
+    """Batched EMIs match calculate_emi and broadcast like NumPy operands."""
+    principals = np.array([100000.0, 0.0, 12000.0, 500000.0])
+    rates = np.array([12.0, 12.0, 0.0, 10.0])
+    tenures = np.array([12.0, 12.0, 12.0, 60.0])
+    emis = calculate_emi_batch(principals, rates, tenures)
+    expected = [calculate_emi(p, r, int(n)) for p, r, n in zip(principals, rates, tenures)]
+    assert np.allclose(emis, expected, atol=0.005)
+
+    grid = calculate_emi_batch(100000, [10.0, 12.0], [[12], [24]])
+    assert grid.shape == (2, 2)
+    assert grid[0, 1] == emis[0]
+    assert calculate_emi_batch(100000, 12.0, 12).shape == ()
+
+    print("  ✓ Batched EMI: PASS")
+
+
+def test_cython_emi_kernels():
+    """The optional Cython kernels (setup.py build_ext) match the default path."""
+    try:
+        from src import _emi
+    except ImportError:
+        print("  - Cython EMI extension not built: SKIP")
+        return
+
+    import json
+    import subprocess
+    principals = [100000.0, 0.0, 12000.0, 500000.0, 7500.5]
+    rates = [12.0, 12.0, 0.0, 10.0, 26.5]
+    tenures = [12.0, 12.0, 12.0, 60.0, 7.0]
+
+    out = np.empty(len(principals))
+    _emi.emi_batch(np.array(principals), np.array(rates), np.array(tenures), out)
+    assert list(out) == list(calculate_emi_batch(principals, rates, tenures))
+    assert _emi.emi(100000.0, 12.0, 12.0) == out[0]
+
+    # loan_engine binds the Cython kernels when numba can't be imported
+    code = (
+        "import sys, json; sys.modules['numba'] = None\n"
+        "from src import loan_engine as le\n"
+        "assert le._emi_batch_kernel.__module__ == 'src._emi'\n"
+        f"print(json.dumps([le.calculate_emi_batch({principals}, {rates}, {tenures}).tolist(),"
+        " le.calculate_emi_batch(100000, [10.0, 12.0], [[12], [24]]).tolist(),"
+        " le.calculate_emi(100000, 12.0, 12)]))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    batch, grid, scalar = json.loads(result.stdout)
+    assert batch == list(out)
+    assert grid == calculate_emi_batch(100000, [10.0, 12.0], [[12], [24]]).tolist()
+    assert scalar == calculate_emi(100000, 12.0, 12)
+
+    print("  ✓ Cython EMI kernels: PASS")
+
+
 # ─── Run All Tests ──────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
@@ -569,6 +654,9 @@ if __name__ == "__main__":
         test_end_to_end_persona_flow,
         test_all_persona_catalogs_exist,
         test_interest_saved_via_subsidy,
+        test_tier_for_array,
+        test_emi_batch,
+        test_cython_emi_kernels,
     ]
 
     passed = 0
@@ -6,8 +6,8 @@ import os
 sys.path.insert(0, os.path.dirname(__file__))
 
 from src.loan_engine import (
-    search_loans, check_loan_eligibility, get_all_loans_catalog,
-    get_loan_categories, TRANSACTION_LOANS, PERSONA_LOANS,
+    search_loans, check_loan_eligibility, check_all_eligibility,
+    get_all_loans_catalog, get_loan_categories, TRANSACTION_LOANS, PERSONA_LOANS,
 )
 
 passed = 0
@@ -59,6 +59,12 @@ check("Education search finds 2+ loans", len(r) >= 2)
 r = search_loans(query="nonexistent_xyz_123")
 check("Bad search returns empty", len(r) == 0)
 
+r = search_loans(query="kisan credit card")
+check("Multi-word phrase search finds KCC", len(r) >= 1 and all("kisan credit card" in l["name"].lower() for l in r))
+
+r = search_loans(query="gold nonexistent loan")
+check("Phrase with unknown inner word returns empty", len(r) == 0)
+
 r = search_loans(query="")
 check("Empty search returns all", len(r) == len(catalog))
 
@@ -261,6 +267,23 @@ for loan_key in TRANSACTION_LOANS:
     check(f"Transaction {loan_key} check works",
           result["verdict"] != "LOAN_NOT_FOUND")
 
+# ── Test 24: Batch eligibility matches per-loan checks ──
+print("\n--- Test 24: Batch Eligibility ---")
+for persona_key in ["", "farmer", "street_vendor"]:
+    for income in [0, 30000]:
+        kwargs = dict(persona=persona_key, score=620, monthly_income=income,
+                      existing_emi=3000, persona_data={"land_acres": 3})
+        batch = check_all_eligibility(**kwargs)
+        expected_keys = [("transaction", k) for k in TRANSACTION_LOANS]
+        if persona_key:
+            expected_keys += [("persona", k) for k in PERSONA_LOANS[persona_key]]
+        check(f"Batch covers catalog ({persona_key or 'transaction'}, {income})",
+              [(r["source"], r["loan_key"]) for r in batch] == expected_keys)
+        check(f"Batch matches single checks ({persona_key or 'transaction'}, {income})",
+              all({k: v for k, v in r.items() if k != "loan_key"} ==
+                  check_loan_eligibility(loan_key=r["loan_key"], source=r["source"], **kwargs)
+                  for r in batch))
+
 # ═══════════════════════════════════════════════════════════
 print("\n" + "=" * 60)
 print(f"RESULTS: {passed} passed, {failed} failed, {passed + failed} total")
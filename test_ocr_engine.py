@@ -31,6 +31,7 @@ from src.ocr_engine import (
     parse_utility_bill,
     merge_parsed_into_persona_data,
     process_file_with_ocr,
+    batch_process_files,
 )
 from src.document_analyzer import (
     analyze_documents,
@@ -480,6 +481,51 @@ def test_process_file_txt():
     print("  ✓ process_file_with_ocr works with text files")
 
 
+def test_batch_process_files():
+    """Test batch_process_files keeps input order and matches single-file results."""
+    files = [
+        (b"This is a student marksheet. CGPA: 8.0. University examination.", "a.txt"),
+        (b"Electricity bill. Consumer No: 1234567. Bill amount: Rs 850. BESCOM", "b.txt"),
+        (b"Land record RTC. Survey No: 45. Land area: 2.5 acres", "c.txt"),
+    ]
+    results = batch_process_files(files)
+    assert [r["filename"] for r in results] == ["a.txt", "b.txt", "c.txt"]
+    for (data, name), result in zip(files, results):
+        single = process_file_with_ocr(data, name)
+        assert result["document_type"] == single["document_type"]
+        assert result["parsed_data"] == single["parsed_data"]
+    assert batch_process_files([]) == []
+    print(f"  Batch types: {[r['document_type'] for r in results]}")
+    print("  ✓ batch_process_files works across files")
+
+
+def _scanned_pdf(pages: int) -> bytes:
+    """Image-only PDF, as a scanner would produce."""
+    from PIL import Image
+    import io
+    images = [Image.new("RGB", (200, 260), "white") for _ in range(pages)]
+    buf = io.BytesIO()
+    images[0].save(buf, format="PDF", save_all=True, append_images=images[1:])
+    return buf.getvalue()
+
+
+def test_batch_process_pdfs():
+    """Test batch_process_files over several scanned PDFs."""
+    import src.ocr_engine as ocr_engine
+    files = [(_scanned_pdf(2), "scan1.pdf"), (_scanned_pdf(1), "scan2.pdf"),
+             (_scanned_pdf(3), "scan3.pdf")]
+    pool_before = ocr_engine._ocr_pool
+    results = batch_process_files(files)
+    assert [r["filename"] for r in results] == ["scan1.pdf", "scan2.pdf", "scan3.pdf"]
+    for (data, name), result in zip(files, results):
+        single = process_file_with_ocr(data, name, parallel=False)
+        assert result["text"] == single["text"]
+        assert result["warnings"] == single["warnings"]
+    # Batch threads OCR pages serially, never through the shared page pool
+    assert ocr_engine._ocr_pool is pool_before
+    print("  ✓ batch_process_files handles scanned PDFs")
+
+
 if __name__ == "__main__":
     tests = [
         ("OCR Capabilities", test_ocr_capabilities),
@@ -500,6 +546,8 @@ if __name__ == "__main__":
         ("E2E General", test_end_to_end_general),
         ("Multi-Document Merge", test_multi_document_merge),
         ("Process File TXT", test_process_file_txt),
+        ("Batch Process Files", test_batch_process_files),
+        ("Batch Process PDFs", test_batch_process_pdfs),
     ]
 
     passed = 0
@@ -1,6 +1,6 @@
 """Quick smoke test for CrediVist pipeline."""
 import pandas as pd
-from src.feature_engineering import engineer_features
+from src.feature_engineering import engineer_features, extract_all_features
 from src.scoring_engine import compute_all_scores, compute_final_score
 from src.ml_model import CreditRiskModel
 
@@ -13,6 +13,13 @@ df = engineer_features(df)
 feat_cols = [c for c in df.columns if c.startswith("feat_")]
 print(f"Features engineered: {feat_cols}")
 
+# Batch features must match the per-profile path used to score one user
+for idx, row in df.iterrows():
+    single = extract_all_features(row)
+    mismatched = {k: (row[k], v) for k, v in single.items() if row[k] != v}
+    assert not mismatched, f"{row['user_id']}: batch vs single {mismatched}"
+print(f"Batch features match extract_all_features on all {len(df)} users")
+
 # Scoring
 df = compute_all_scores(df)
 print(f"Base scores computed. Mean: {df['base_trust_score'].mean():.0f}")